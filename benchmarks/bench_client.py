@@ -0,0 +1,135 @@
+"""
+Benchmark: latency and throughput of Wsimple against the local mock server.
+Covers login, order submission, get_orders, activity pagination, the dashboard
+aggregate and realtime websocket dispatch, so changes to requestor, Box handling
+or token management can be compared offline.
+usage: python benchmarks/bench_client.py [--latency 0.02] [--repeat 50] [--response-format box]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from wsimple.api import RealtimeClient, Wsimple
+
+from mock_server import MockWealthsimple, SECURITY_ID
+
+
+def bench_client(mock: MockWealthsimple, response_format: str):
+    class BenchWsimple(Wsimple):
+        BASE_URL = mock.base_url
+        BASE_PUBLIC_URL = mock.base_url
+        BASE_STATUS_URL = mock.base_url
+        WEBSOCKET_URL = mock.websocket_url
+
+    def login():
+        return BenchWsimple(
+            "bench@example.com",
+            "password",
+            verbose_mode=False,
+            otp_callback=lambda: 123456,
+            response_format=response_format,
+        )
+
+    return login
+
+
+def measure(name: str, call, repeat: int, items: int = 1):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        "{:>18}: p50 {:8.2f} ms  p95 {:8.2f} ms  {:10.0f} items/s".format(
+            name,
+            statistics.median(samples) * 1000,
+            p95 * 1000,
+            items * repeat / sum(samples),
+        )
+    )
+
+
+def bench_realtime(ws: Wsimple, events: int):
+    async def run():
+        client = RealtimeClient(ws, queue_size=events)
+        received = 0
+        done = asyncio.Event()
+
+        @client.on("*", executor=False)
+        def count(event):
+            nonlocal received
+            received += 1
+            if received >= events:
+                done.set()
+
+        task = asyncio.ensure_future(client.run())
+        start = time.perf_counter()
+        await asyncio.wait_for(done.wait(), 60)
+        elapsed = time.perf_counter() - start
+        await client.close()
+        await task
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    print(
+        "{:>18}: {:8.2f} ms for {} events  {:10.0f} events/s".format(
+            "websocket dispatch", elapsed * 1000, events, events / elapsed
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--activities", type=int, default=500)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--response-format", default="box")
+    parser.add_argument("--payloads", default=None)
+    args = parser.parse_args()
+    with MockWealthsimple(
+        latency=args.latency,
+        orders=args.orders,
+        activities=args.activities,
+        events=args.events + 1,
+        payloads=args.payloads,
+    ) as mock:
+        login = bench_client(mock, args.response_format)
+        print(
+            "mock latency {} ms, response_format {}".format(
+                args.latency * 1000, args.response_format
+            )
+        )
+        ws = login()
+        measure("login", login, max(1, args.repeat // 5))
+        measure(
+            "market_buy_order",
+            lambda: ws.market_buy_order(SECURITY_ID, quantity=1),
+            args.repeat,
+        )
+        measure(
+            "send_orders x10",
+            lambda: ws.send_orders([{"security_id": SECURITY_ID}] * 10),
+            args.repeat,
+            items=10,
+        )
+        measure("get_orders", ws.get_orders, args.repeat, items=args.orders)
+        measure(
+            "iter_activities",
+            lambda: sum(1 for _ in ws.iter_activities()),
+            max(1, args.repeat // 5),
+            items=args.activities,
+        )
+        measure("dashboard", ws.dashboard, args.repeat)
+        measure("refresh_token", ws.token_manager.refresh, max(1, args.repeat // 5))
+        bench_realtime(ws, args.events)
+        ws.close()
+        print("mock served {} requests".format(mock.requests))
+
+
+if __name__ == "__main__":
+    main()
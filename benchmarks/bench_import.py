@@ -0,0 +1,55 @@
+"""
+Benchmark: start-up cost of wsimple in fresh interpreters, and which heavy
+dependencies every stage loads.
+usage: python benchmarks/bench_import.py [repeat]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY = ("cloudscraper", "requests", "box", "loguru", "websockets", "orjson")
+
+STAGES = {
+    "import wsimple": "import wsimple",
+    "from wsimple import Wsimple": "from wsimple import Wsimple",
+    "Wsimple.public()": "from wsimple import Wsimple\nWsimple.public(verbose=False).session.session",
+    "cloudscraper session": "from wsimple import SessionPool\nSessionPool().session",
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+import json
+print(json.dumps([elapsed, [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def run(code: str):
+    out = subprocess.check_output(
+        [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY)]
+    )
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+
+def main(repeat: int = 10):
+    print(f"python {sys.version.split()[0]}, best/median of {repeat} fresh interpreters")
+    for name, code in STAGES.items():
+        samples, loaded = [], []
+        for _ in range(repeat):
+            elapsed, loaded = run(code)
+            samples.append(elapsed)
+        print(
+            "{:>28}: best {:7.1f} ms  median {:7.1f} ms  loads {}".format(
+                name,
+                min(samples) * 1000,
+                statistics.median(samples) * 1000,
+                ", ".join(loaded) or "-",
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
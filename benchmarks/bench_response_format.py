@@ -0,0 +1,52 @@
+"""
+Benchmark: cost of turning a large get_orders payload into Box, dict and model responses.
+usage: python benchmarks/bench_response_format.py [orders] [repeat]
+"""
+import json
+import sys
+import timeit
+
+from wsimple.api.models import Order
+from wsimple.api.requestor import loads, parse_response
+
+
+def make_orders_payload(count: int) -> bytes:
+    order = {
+        "order_id": "order-{}",
+        "account_id": "non-registered-abc123",
+        "security_id": "sec-s-76a7155242e8477880cbb43269235cb6",
+        "symbol": "AAPL",
+        "status": "posted",
+        "order_type": "buy_quantity",
+        "order_sub_type": "limit",
+        "quantity": 2,
+        "fill_quantity": 2,
+        "limit_price": {"amount": 120.5, "currency": "USD"},
+        "fill_price": {"amount": 120.31, "currency": "USD"},
+        "market_value": {"amount": 240.62, "currency": "USD"},
+        "created_at": "2021-03-01T15:00:00.000Z",
+        "filled_at": "2021-03-01T15:00:01.000Z",
+        "time_in_force": "day",
+        "fills": [{"price": {"amount": 120.31, "currency": "USD"}, "quantity": 2}],
+    }
+    results = [dict(order, order_id="order-{}".format(i)) for i in range(count)]
+    return json.dumps({"results": results, "bookmark": None}).encode()
+
+
+def main(count: int = 2000, repeat: int = 20):
+    content = make_orders_payload(count)
+    cases = {
+        "box (default)": lambda: parse_response(json.loads(content), "box"),
+        "dict": lambda: parse_response(loads(content), "dict"),
+        "model": lambda: parse_response(loads(content), "model", Order),
+    }
+    print(f"{count} orders, {len(content) / 1024:.0f} KiB, json parser: {loads.__module__}")
+    baseline = None
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"{name:>14}: {best * 1000:8.2f} ms  ({baseline / best:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
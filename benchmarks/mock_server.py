@@ -0,0 +1,301 @@
+"""
+Stand-in Wealthsimple Trade server for offline benchmarks.
+Serves every Endpoints route over http with generated payloads (or the recorded
+ones found in a payloads directory as <ENDPOINT_NAME>.json) after a configurable
+latency, plus a websocket that streams realtime events.
+usage: python benchmarks/mock_server.py [--port 8000] [--latency 0.02] [--payloads DIR]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+
+from wsimple.api.endpoints import Endpoints
+
+from bench_response_format import make_orders_payload
+
+ACCOUNT_ID = "non-registered-abc123"
+SECURITY_ID = "sec-s-76a7155242e8477880cbb43269235cb6"
+EVENT_TYPES = ("PRICE_QUOTE", "ACCOUNT", "ORDER_FILLED")
+
+
+def _routes():
+    """ (method, compiled path pattern, endpoint) for every route, most specific first """
+    routes = []
+    for endpoint in Endpoints:
+        if not isinstance(endpoint.value, tuple):
+            continue
+        path = re.escape(endpoint.value.route.replace("{base}", "/"))
+        path = re.sub(r"\\\{\w+\\\}", "[^/]+", path)
+        routes.append((endpoint.value.method, re.compile(path + "$"), endpoint))
+    routes.sort(key=lambda route: route[1].pattern.count("[^/]+"))
+    return routes
+
+
+def _money(amount: float) -> dict:
+    return {"amount": amount, "currency": "CAD"}
+
+
+def make_activities(count: int) -> list:
+    start = datetime(2021, 3, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": "activity-{}".format(i),
+            "type": "buy",
+            "account_id": ACCOUNT_ID,
+            "security_id": SECURITY_ID,
+            "symbol": "AAPL",
+            "quantity": 1,
+            "market_value": _money(120.5),
+            "occurred_at": (start - timedelta(hours=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+class MockWealthsimple:
+    """
+    MockWealthsimple: runs the http and websocket servers on background threads.
+    Where ***latency*** is the seconds every http response is delayed.
+    Where ***orders***, ***activities*** are the sizes of the generated lists.
+    Where ***events*** is how many websocket events are sent to every connection.
+    Where ***payloads*** is a directory of recorded <ENDPOINT_NAME>.json responses.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        orders: int = 200,
+        activities: int = 500,
+        events: int = 10000,
+        payloads: str = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.events = events
+        self.routes = _routes()
+        self.requests = 0
+        self._orders = make_orders_payload(orders)
+        self._activities = make_activities(activities)
+        self._recorded = {}
+        if payloads is not None:
+            for name in os.listdir(payloads):
+                if name.endswith(".json"):
+                    with open(os.path.join(payloads, name), "rb") as file:
+                        self._recorded[name[:-5]] = file.read()
+        self._http = None
+        self._loop = None
+        self.ws_port = None
+
+    #! payloads
+    def respond(self, endpoint: Endpoints, query: dict, body: bytes):
+        """ (status, headers, content) of a request to ***endpoint*** """
+        headers = {}
+        if endpoint in (Endpoints.LOGIN, Endpoints.REFRESH):
+            if endpoint == Endpoints.LOGIN and b"otp" not in body:
+                return (
+                    401,
+                    {
+                        "x-wealthsimple-otp-required": "true",
+                        "x-wealthsimple-otp": "required; method=app",
+                        "x-ws-device-id": "device-1",
+                    },
+                    b"{}",
+                )
+            headers = {
+                "X-Access-Token": "access-{}".format(self.requests),
+                "X-Refresh-Token": "refresh-{}".format(self.requests),
+                "X-Access-Token-Expires": str(int(time.time()) + 3600),
+            }
+        if endpoint.name in self._recorded:
+            return 200, headers, self._recorded[endpoint.name]
+        if endpoint == Endpoints.GET_ORDERS:
+            return 200, headers, self._orders
+        return 200, headers, json.dumps(self.payload(endpoint, query, body)).encode()
+
+    def payload(self, endpoint: Endpoints, query: dict, body: bytes):
+        if endpoint in (Endpoints.LOGIN, Endpoints.REFRESH, Endpoints.GET_ME):
+            return {"id": "user-1", "email": "bench@example.com"}
+        if endpoint == Endpoints.GET_ACCOUNT_LIST:
+            return {
+                "results": [
+                    {
+                        "id": ACCOUNT_ID,
+                        "account_type": "ca_non_registered",
+                        "deleted_at": None,
+                        "buying_power": _money(1000),
+                    }
+                ]
+            }
+        if endpoint == Endpoints.SEND_ORDER:
+            order = json.loads(body or b"{}")
+            order_id = "order-{}".format(self.requests)
+            return {**order, "order_id": order_id, "status": "submitted"}
+        if endpoint == Endpoints.GET_ACTIVITES:
+            offset = int(query.get("bookmark", ["0"])[0])
+            limit = int(query.get("limit", ["20"])[0])
+            page = self._activities[offset : offset + limit]
+            bookmark = None
+            if offset + limit < len(self._activities):
+                bookmark = str(offset + limit)
+            return {"results": page, "bookmark": bookmark}
+        if endpoint == Endpoints.GET_MOBILE_DASHBOARD:
+            return {
+                "accounts": [
+                    {
+                        "buying_power": _money(1000),
+                        "net_deposits": _money(5000),
+                        "available_to_withdraw": _money(900),
+                    }
+                ],
+                "positions": [{"id": SECURITY_ID, "quantity": 2}],
+                "watchlist": [{"id": SECURITY_ID}],
+            }
+        if endpoint == Endpoints.GET_ACCOUNT_HISTORY:
+            return {
+                "previous_close_net_liquidation_value": _money(5000),
+                "results": [
+                    {"date": "2021-03-01", "value": _money(5000 + i)} for i in range(100)
+                ],
+            }
+        if endpoint == Endpoints.GET_WEBSOCKET_URI:
+            return {"ticket": "ticket-{}".format(self.requests)}
+        if endpoint == Endpoints.GET_CURRENT_STATUS:
+            return {
+                "status": {"indicator": "none", "description": "All Systems Operational"}
+            }
+        return {"results": []}
+
+    #! servers
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # one buffered write per response, no nagle/delayed-ack stalls on keep-alive
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def _serve(self):
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                mock.requests += 1
+                for method, pattern, endpoint in mock.routes:
+                    if method == self.command and pattern.match(url.path):
+                        break
+                else:
+                    self._send(404, {}, b"{}")
+                    return
+                if mock.latency:
+                    time.sleep(mock.latency)
+                self._send(*mock.respond(endpoint, parse_qs(url.query), body))
+
+            def _send(self, status, headers, content):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    async def _stream(self, websocket, path=None):
+        await websocket.send(json.dumps({"type": "GREETING"}))
+        for i in range(self.events):
+            await websocket.send(
+                json.dumps(
+                    {
+                        "type": EVENT_TYPES[i % len(EVENT_TYPES)],
+                        "security_id": SECURITY_ID,
+                        "quote": {"amount": 120 + i % 100 / 100},
+                        "sequence": i,
+                    }
+                )
+            )
+        await websocket.wait_closed()
+
+    def _run_websocket(self, started: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        async def serve():
+            server = await websockets.serve(self._stream, self.host, 0)
+            self.ws_port = server.sockets[0].getsockname()[1]
+            started.set()
+            await asyncio.Future()
+
+        try:
+            self._loop.run_until_complete(serve())
+        except RuntimeError:
+            pass
+
+    def start(self) -> "MockWealthsimple":
+        self._http = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._http.daemon_threads = True
+        self.port = self._http.server_address[1]
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        started = threading.Event()
+        threading.Thread(target=self._run_websocket, args=(started,), daemon=True).start()
+        started.wait(10)
+        return self
+
+    def stop(self):
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    @property
+    def base_url(self) -> str:
+        return "http://{}:{}/".format(self.host, self.port)
+
+    @property
+    def websocket_url(self) -> str:
+        return "ws://{}:{}/websocket?ticket={{}}&version=2".format(self.host, self.ws_port)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--payloads", default=None)
+    args = parser.parse_args()
+    mock = MockWealthsimple(
+        args.host, args.port, latency=args.latency, payloads=args.payloads
+    ).start()
+    print("http: {}\nwebsocket: {}".format(mock.base_url, mock.websocket_url))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,8 @@
 import asyncio
-import json
 
-from wsimple.api import Wsimple
+from wsimple.api import Wsimple, RealtimeClient
 # access realtime data - pip install websockets
 # websockets requires Python ≥ 3.6.1
-import websockets 
 
 # login to Wealthsimple
 def get_otp():
@@ -14,34 +12,23 @@ email = str(input("Enter email: \n>>>"))
 password = str(input("Enter password: \n>>>"))
 
 ws = Wsimple(email, password, otp_callback=get_otp) 
+client = RealtimeClient(ws)
 
+@client.on("GREETING")
 def event_greeting(data):
     print(data)
-    
+
+@client.on("ACCOUNT")
 def event_account(data):
     print(data)
-    
+
+@client.on("PRICE_QUOTE")
 def event_price_quote(data):
     print(data)  
-    
+
+@client.on("ORDER_FILLED")
 def event_order_filled(data):
     print(data) 
 
-async def ws_realtimedata():
-    uri = ws.get_websocket_uri() 
-    async with websockets.connect(uri) as websocket:
-        while True:
-            data = await websocket.recv()
-            data = json.loads(data)
-            if data["type"] == "GREETING":
-                await event_greeting(data)
-            elif data["type"] == "ACCOUNT":
-                await event_account(data)
-            elif data["type"] == "PRICE_QUOTE":
-                await event_price_quote(data)
-            elif data["type"] == "ORDER_FILLED": 
-                await event_order_filled(data)  
-            else:
-                print("unsupported event: {}", data["type"]) 
-                                         
-asyncio.get_event_loop().run_until_complete(ws_realtimedata())
+# reconnects with a fresh ticket whenever the connection drops
+asyncio.get_event_loop().run_until_complete(client.run())
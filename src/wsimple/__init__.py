@@ -1,11 +1,45 @@
-from .api import Wsimple
+from typing import TYPE_CHECKING
 
-from .api import TokensBox
+# re-exported lazily from wsimple.api, see wsimple/api/__init__.py
+__all__ = [
+    "Wsimple",
+    "AsyncWsimple",
+    "WsimplePool",
+    "SessionPool",
+    "TokensBox",
+    "LoginError",
+    "InvalidAccessTokenError",
+    "InvalidRefreshTokenError",
+    "WSOTPError",
+    "WSOTPLoginError",
+]
 
-from .api import LoginError
-from .api import InvalidAccessTokenError
-from .api import InvalidRefreshTokenError
 
-from .api import WSOTPError
-from .api import WSOTPLoginError
+def __getattr__(name):
+    if name in __all__:
+        from . import api
 
+        value = getattr(api, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .api import Wsimple
+    from .api import AsyncWsimple
+    from .api import WsimplePool
+
+    from .api import SessionPool
+    from .api import TokensBox
+
+    from .api import LoginError
+    from .api import InvalidAccessTokenError
+    from .api import InvalidRefreshTokenError
+
+    from .api import WSOTPError
+    from .api import WSOTPLoginError
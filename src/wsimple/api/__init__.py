@@ -2,12 +2,102 @@
  Wsimple v1.0
  No Copyright (c) please take: 2020 Chromazmoves
 """
-from .api import Wsimple
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from .tokens import TokensBox
+# public name -> submodule, imported on first attribute access (PEP 562)
+# so that `import wsimple` does not load cloudscraper, requests, box or websockets.
+_EXPORTS = {
+    "Wsimple": ".api",
+    "AsyncWsimple": ".async_api",
+    "WsimplePool": ".pool",
+    "RealtimeClient": ".realtime",
+    "QuoteHub": ".quotes",
+    "PortfolioSnapshot": ".portfolio",
+    "SessionPool": ".session",
+    "ResponseCache": ".cache",
+    "MemoryCache": ".cache",
+    "DiskCache": ".cache",
+    "RetryPolicy": ".resilience",
+    "CircuitBreaker": ".resilience",
+    "RateLimiter": ".ratelimit",
+    "SQLiteRateLimiter": ".ratelimit",
+    "Metrics": ".metrics",
+    "Endpoints": ".endpoints",
+    "AccountRegistry": ".accounts",
+    "SecurityMaster": ".securities",
+    "FxRates": ".fx",
+    "RateSnapshot": ".fx",
+    "MarketCalendar": ".markets",
+    "BatchResult": ".concurrency",
+    "LocalStore": ".store",
+    "Account": ".models",
+    "Activity": ".models",
+    "Order": ".models",
+    "Position": ".models",
+    "Quote": ".models",
+    "HistoricalFrame": ".frames",
+    "TokensBox": ".tokens",
+    "TokenManager": ".tokens",
+    "TokenStore": ".token_store",
+    "FileTokenStore": ".token_store",
+    "KeyringTokenStore": ".token_store",
+    "CallbackTokenStore": ".token_store",
+    "LoginError": ".errors",
+    "InvalidAccessTokenError": ".errors",
+    "InvalidRefreshTokenError": ".errors",
+    "WSOTPError": ".errors",
+    "WSOTPLoginError": ".errors",
+    "WealthsimpleServerError": ".errors",
+    "CircuitOpenError": ".errors",
+}
 
-from .errors import LoginError
-from .errors import InvalidAccessTokenError
-from .errors import InvalidRefreshTokenError
-from .errors import WSOTPError
-from .errors import WSOTPLoginError
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from .api import Wsimple
+    from .async_api import AsyncWsimple
+    from .pool import WsimplePool
+    from .realtime import RealtimeClient
+    from .quotes import QuoteHub
+    from .portfolio import PortfolioSnapshot
+
+    from .session import SessionPool
+    from .cache import ResponseCache, MemoryCache, DiskCache
+    from .resilience import RetryPolicy, CircuitBreaker
+    from .ratelimit import RateLimiter, SQLiteRateLimiter
+    from .metrics import Metrics
+    from .endpoints import Endpoints
+    from .accounts import AccountRegistry
+    from .securities import SecurityMaster
+    from .fx import FxRates, RateSnapshot
+    from .markets import MarketCalendar
+    from .concurrency import BatchResult
+    from .store import LocalStore
+    from .models import Account, Activity, Order, Position, Quote
+    from .frames import HistoricalFrame
+    from .tokens import TokensBox, TokenManager
+    from .token_store import TokenStore, FileTokenStore
+    from .token_store import KeyringTokenStore, CallbackTokenStore
+
+    from .errors import LoginError
+    from .errors import InvalidAccessTokenError
+    from .errors import InvalidRefreshTokenError
+    from .errors import WSOTPError
+    from .errors import WSOTPLoginError
+    from .errors import WealthsimpleServerError
+    from .errors import CircuitOpenError
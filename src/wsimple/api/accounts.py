@@ -0,0 +1,72 @@
+"""
+Project Name: Wsimple
+File Name: api/accounts.py
+**File: Registry of account ids indexed by friendly account name**
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .errors import MethodInputError
+
+if TYPE_CHECKING:
+    from box import Box
+
+
+class AccountRegistry:
+    """
+    AccountRegistry: caches the friendly name -> account id mapping returned by
+    Wsimple.accounts so that order submission does not pay for GET_ACCOUNT_LIST.
+    The mapping is loaded on first use and reloaded once it is older than ***ttl***.
+    """
+
+    def __init__(
+        self, loader: Callable[..., "Box"], ttl: Optional[timedelta] = timedelta(hours=1)
+    ):
+        self._loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._accounts: Optional["Box"] = None
+        self._loaded_at: Optional[datetime] = None
+
+    @property
+    def stale(self) -> bool:
+        if self._accounts is None:
+            return True
+        if self.ttl is None:
+            return False
+        return datetime.now() - self._loaded_at >= self.ttl
+
+    def _load(self, tokens=None) -> "Box":
+        self._accounts = self._loader(tokens=tokens)
+        self._loaded_at = datetime.now()
+        return self._accounts
+
+    def refresh(self, tokens=None) -> "Box":
+        """ reload the account ids from Wealthsimple """
+        with self._lock:
+            return self._load(tokens=tokens)
+
+    def invalidate(self):
+        """ drop the cached account ids, the next lookup reloads them """
+        with self._lock:
+            self._accounts = None
+            self._loaded_at = None
+
+    def all(self, tokens=None) -> "Box":
+        """ grab every account id, loading them if missing or stale """
+        if self.stale:
+            with self._lock:
+                if self.stale:
+                    self._load(tokens=tokens)
+        return self._accounts
+
+    def get(self, name: str = "personal", tokens=None) -> str:
+        """
+        Grab an account id by its friendly name.
+        Where ***name*** is one of [personal, tfsa, rrsp, crypto]: autoset "personal".
+        """
+        accounts = self.all(tokens=tokens)
+        if name not in accounts:
+            raise MethodInputError(f"no open {name} account found")
+        return accounts[name]
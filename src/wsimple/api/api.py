@@ -8,24 +8,72 @@ File Name: api/api.py
 # standard library
 import sys
 import json
-from datetime import datetime, timedelta
-from typing import Callable, Optional, Union
+import threading
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Union
 
 # custom error
 from .errors import LoginError
 from .errors import InvalidAccessTokenError, InvalidRefreshTokenError
 from .errors import OTPCallbackNone, WSOTPError, TSXStopLimitPriceError
-from .errors import WealthsimpleDownException
+from .errors import WealthsimpleDownException, MethodInputError
+from .errors import WealthsimpleServerError
 from .endpoints import Endpoints
-from .requestor import requestor
-from .tokens import TokensBox
-
-# third party
-import requests
-from box import Box
-from loguru import logger
-
-logger.remove()
+from .requestor import requestor, RESPONSE_FORMATS
+from .models import Account, Activity, Order, Position, Quote
+from .frames import check_frames_path, to_frame, write_frames
+from .concurrency import fan_out, iter_batch, run_batch
+from .accounts import AccountRegistry
+from .session import SessionPool
+from .cache import MemoryCache, ResponseCache
+from .securities import SecurityMaster
+from .fx import FxRates
+from .markets import MarketCalendar
+from .resilience import CircuitBreaker, RetryPolicy
+from .ratelimit import RateLimiter
+from .metrics import Metrics
+from .tokens import TokensBox, TokenManager
+from .token_store import TokenStore
+
+_logger = None
+_logger_handler = None
+_logger_lock = threading.Lock()
+
+
+def _get_logger(verbose: bool = True):
+    """
+    import loguru on first use, drop its default handler and keep a single stderr
+    handler at the most verbose level any instance asked for, so that creating
+    many instances does not stack up handlers.
+    """
+    global _logger, _logger_handler
+    with _logger_lock:
+        if _logger is None:
+            from loguru import logger
+
+            logger.remove()
+            _logger = logger
+        level = "DEBUG" if verbose else "SUCCESS"
+        levelno = _logger.level(level).no
+        if _logger_handler is None or levelno < _logger_handler[1]:
+            if _logger_handler is not None:
+                _logger.remove(_logger_handler[0])
+            _logger_handler = (_logger.add(sys.stderr, level=level), levelno)
+    return _logger
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """ parse a Wealthsimple ISO-8601 timestamp into an aware datetime """
+    return _as_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def _as_utc(value: datetime) -> datetime:
+    """ naive datetimes are assumed to be in UTC """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
 
 
 class Wsimple:
@@ -34,6 +82,7 @@ class Wsimple:
     BASE_URL = Endpoints.BASE.value
     BASE_PUBLIC_URL = Endpoints.BASE_PUBLIC.value
     BASE_STATUS_URL = Endpoints.BASE_STATUS.value
+    WEBSOCKET_URL = "wss://trade-service.wealthsimple.com/websocket?ticket={}&version=2"
 
     time_ranges = ["1d", "1w", "1m", "3m", "1y", "all"]
     activities_types = [
@@ -106,22 +155,109 @@ class Wsimple:
         tokens: Optional[list] = None,
         internally_manage_tokens: bool = True,
         otp_callback: Callable[[], int] = None,
+        pool_size: int = 10,
+        session: Optional[SessionPool] = None,
+        fan_out_workers: int = 5,
+        accounts_ttl: Optional[timedelta] = timedelta(hours=1),
+        response_format: str = "box",
+        cache: Union[ResponseCache, bool] = True,
+        background_refresh: bool = True,
+        securities: Optional[SecurityMaster] = None,
+        retry: Union[RetryPolicy, bool] = True,
+        breaker: Union[CircuitBreaker, bool] = True,
+        limiter: Union[RateLimiter, bool] = False,
+        metrics: Optional[Metrics] = None,
+        token_store: Optional[TokenStore] = None,
+        fx_max_age: timedelta = timedelta(minutes=1),
     ):
         """
         Wsimple._\_\_init_\_\_() initializes the Wsimple class and logs the user in using
         the provided email and password. Alternatively, the classmethod public can access the
         functions prefixed with public without using a Wealthsimple account.
-        """
+        Where ***pool_size*** is the amount of keep-alive connections kept open: autoset 10.
+        Where ***session*** is an existing SessionPool to share between instances,
+        public clients get a plain requests session without the cloudflare scraper.
+        Where ***fan_out_workers*** bounds the concurrent sub-requests of page functions: autoset 5.
+        Where ***accounts_ttl*** is how long account ids are cached, None never expires: autoset 1 hour.
+        Where ***response_format*** is "box", "dict" (plain json) or "model" (slotted
+        Order, Activity, Position, Quote and Account objects): autoset "box".
+        Where ***cache*** is a ResponseCache for reference data (markets, forex, featured and
+        security groups, quotes are never cached by default), True for an in-memory cache or False to disable it: autoset True.
+        Where ***retry*** is a RetryPolicy (per endpoint timeouts, jittered retries of GET requests),
+        True for the default policy or False to disable it: autoset True.
+        Where ***breaker*** is a CircuitBreaker that pauses requests while Wealthsimple keeps failing,
+        True for a new one or False to disable it, a breaker without probe probes is_operational: autoset True.
+        Where ***limiter*** is a RateLimiter (or SQLiteRateLimiter shared by processes) pacing
+        requests per endpoint, True for the default rates or False to disable it: autoset False.
+        The default rates are conservative guesses, pass your own budgets for order heavy use.
+        Where ***metrics*** is a Metrics recording latency, status codes, retries, bytes,
+        decode time and token refreshes: autoset None.
+        Only used when no ***session*** is given, a shared session keeps its own cache, retry, breaker, limiter and metrics.
+        Where ***token_store*** is a TokenStore (FileTokenStore, KeyringTokenStore, CallbackTokenStore)
+        whose tokens are used instead of logging in, it is written after every login and refresh: autoset None.
+        Where ***background_refresh*** refreshes the tokens on a timer before they are due: autoset True.
+        Where ***securities*** is a SecurityMaster to share between instances: autoset a new in-memory index.
+        Where ***fx_max_age*** is how long the forex rates used by exchange_to and convert_currency are reused: autoset 1 minute.
+        """
+        if response_format not in RESPONSE_FORMATS:
+            raise MethodInputError(
+                f"response_format must be one of {RESPONSE_FORMATS}, not {response_format}"
+            )
         self.email = email
+        self.response_format = response_format
+        self.background_refresh = background_refresh
+        self.token_manager: Optional[TokenManager] = None
+        self.token_store = token_store
+        if session is None:
+            if cache is True:
+                cache = MemoryCache()
+            elif cache is False:
+                cache = None
+            if retry is True:
+                retry = RetryPolicy()
+            elif retry is False:
+                retry = None
+            if breaker is True:
+                breaker = CircuitBreaker()
+            elif breaker is False:
+                breaker = None
+            if limiter is True:
+                limiter = RateLimiter()
+            elif limiter is False:
+                limiter = None
+            session = SessionPool(
+                pool_size,
+                scraper=not public_mode,
+                cache=cache,
+                retry=retry,
+                breaker=breaker,
+                limiter=limiter,
+                metrics=metrics,
+            )
+        self.session = session
+        breaker = getattr(session, "breaker", None)
+        if breaker is not None and breaker.probe is None:
+            breaker.probe = self._probe_operational
+        self._fan_out_pool = ThreadPoolExecutor(
+            max_workers=fan_out_workers, thread_name_prefix="wsimple-fan-out"
+        )
+        self.account_registry = AccountRegistry(self.accounts, ttl=accounts_ttl)
+        self.securities = SecurityMaster() if securities is None else securities
+        self.fx = FxRates(
+            self.get_exchange_rate,
+            max_age=fx_max_age,
+            invalidate=lambda: self.invalidate_cache(Endpoints.GET_EXCHANGE_RATE),
+        )
+        self.markets = MarketCalendar(
+            self.get_all_markets,
+            self.exh_to_mic,
+            invalidate=lambda: self.invalidate_cache(Endpoints.GET_ALL_MARKETS),
+        )
         self.public_mode = public_mode
         self.verbose = verbose_mode
         self.oauth_mode = oauth_mode
-        self.logger = logger
+        self.logger = _get_logger(self.verbose)
         self.internally_manage_tokens = internally_manage_tokens
-        if not self.verbose:
-            self.logger.add(sys.stderr, level="SUCCESS")
-        else:
-            self.logger.add(sys.stderr)
 
         if self.public_mode:
             self.logger.info("Mode: Public")
@@ -129,6 +265,8 @@ class Wsimple:
         elif self.oauth_mode:
             self.logger.info("Mode: Oauth (Bypass)")
             self.tokens = tokens
+        elif self._restore_tokens():
+            self.logger.info("Mode: Stored tokens")
         else:
             payload = {"email": email, "password": password}
             r = requestor(
@@ -137,6 +275,7 @@ class Wsimple:
                 login_refresh=True,
                 json=payload,
                 logger=self.logger,
+                session=self.session,
             )
             self.logger.debug(f"Pre-login: {r.status_code}/ {str(r.content)}")
             if "x-wealthsimple-otp-required" in r.headers:
@@ -162,6 +301,7 @@ class Wsimple:
                         login_refresh=True,
                         json=payload,
                         logger=self.logger,
+                        session=self.session,
                     )
                     del payload
                     #! natural code login
@@ -174,6 +314,9 @@ class Wsimple:
                                     int(r.headers["X-Access-Token-Expires"])
                                 ),
                             )
+                            if self.token_store is not None:
+                                with self.token_store.lock():
+                                    self.token_store.save(self.box)
                         else:
                             self.access_token = r.headers["X-Access-Token"]
                             self.refresh_token = r.headers["X-Refresh-Token"]
@@ -196,7 +339,8 @@ class Wsimple:
             args={"base": self.BASE_URL},
             data=tokens[1],
             login_refresh=True,
-            logger=self.logger
+            logger=self.logger,
+            session=self.session,
         )
         if r.status_code == 401:
             self.logger.error("Dead refresh token")
@@ -225,6 +369,78 @@ class Wsimple:
         wsimple = cls("", "", oauth_mode=True, tokens=token_dict, verbose_mode=verbose)
         return wsimple
 
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self.session.cache
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        return getattr(self.session, "metrics", None)
+
+    @property
+    def box(self) -> Optional[TokensBox]:
+        if self.token_manager is None:
+            return None
+        return self.token_manager.box
+
+    @box.setter
+    def box(self, box: TokensBox):
+        if self.token_manager is None:
+            self.token_manager = TokenManager(
+                box,
+                lambda tokens: self.refresh_token(tokens=tokens),
+                background=self.background_refresh,
+                logger=self.logger,
+                metrics=self.metrics,
+                store=self.token_store,
+            )
+        else:
+            self.token_manager.replace(box)
+
+    def _restore_tokens(self) -> bool:
+        """
+        Adopt the tokens of the token store instead of logging in, refreshing them
+        first when they already expired. False when there is nothing usable to adopt.
+        """
+        if self.token_store is None or not self.internally_manage_tokens:
+            return False
+        try:
+            box = self.token_store.load()
+        except Exception as error:
+            self.logger.warning(f"could not read the token store: {error}")
+            return False
+        if box is None:
+            return False
+        self.box = box
+        if box.access_expires <= datetime.now():
+            try:
+                self.token_manager.refresh(stale=box)
+            except InvalidRefreshTokenError:
+                self.logger.info("stored refresh token is dead, logging in")
+                self.token_manager.stop()
+                self.token_manager = None
+                return False
+        return True
+
+    def invalidate_cache(self, endpoint: Optional[Endpoints] = None):
+        """
+        Drop cached responses of an endpoint, or of every endpoint when None.
+        Where ***endpoint*** is an Endpoints member, e.g. Endpoints.GET_EXCHANGE_RATE.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(endpoint)
+
+    def close(self, close_session: bool = True):
+        """
+        Close all pooled connections and worker threads held by this instance.
+        Where ***close_session*** is False to keep a shared SessionPool open: autoset True.
+        """
+        if self.token_manager is not None:
+            self.token_manager.stop()
+        self._fan_out_pool.shutdown(wait=False)
+        if close_session:
+            self.session.close()
+
     @classmethod
     def public(cls, verbose=False):
         """
@@ -234,14 +450,11 @@ class Wsimple:
         return wsimple
      
     def _manage_tokens(f):
+        @wraps(f)
         def wrap_manage_tokens(self, *args, **kwargs):
             self.logger.info(f"Tokens: {self.box} {args} {kwargs}")
             if self.internally_manage_tokens:
-                diff = self.box.access_expires - datetime.now()
-                self.logger.debug(f"Reset in -> {diff}")
-                if diff < timedelta(minutes=15):
-                    self.box = self.refresh_token(tokens=self.box.tokens)
-                kwargs["tokens"] = self.box.tokens
+                kwargs["tokens"] = self.token_manager.tokens()
                 return f(self, *args, **kwargs)
             else:
                 return f(self, *args, **kwargs)
@@ -249,15 +462,19 @@ class Wsimple:
 
     #! account related functions
     @_manage_tokens
-    def get_accounts(self, tokens=None):
+    def get_accounts(self, tokens=None, response_format: Optional[str] = None):
         """
         Grabs all accounts information
+        Where ***response_format*** is one of [box, dict, model]: autoset to the client response_format.
         """
         return requestor(
             Endpoints.GET_ACCOUNT_LIST,
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
+            response_format=response_format or self.response_format,
+            model=Account,
         )
 
     @_manage_tokens
@@ -275,6 +492,7 @@ class Wsimple:
             params=params,
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -284,7 +502,9 @@ class Wsimple:
         """
         try:
             self.logger.debug("accounts call")
-            accounts = self.get_accounts(tokens=tokens)["results"]
+            accounts = self.get_accounts(tokens=tokens, response_format="dict")[
+                "results"
+            ]
             res = {}
             for account in accounts:
                 k = self.friendly_account_name[account["account_type"]]
@@ -294,10 +514,18 @@ class Wsimple:
                 else:
                     res[k] = account["id"]
             self.logger.debug(f"accounts ^^^")
+            from box import Box
+
             return Box(res)
         except InvalidAccessTokenError:
             raise InvalidAccessTokenError
 
+    def refresh_accounts(self, tokens=None):
+        """
+        Reload the cached account ids used when account_id is not given.
+        """
+        return self.account_registry.refresh(tokens=tokens)
+
     @_manage_tokens
     def get_historical_portfolio_data(
         self, tokens=None, time: str = "1d", account_id: Optional[str] = None
@@ -306,15 +534,16 @@ class Wsimple:
         Grabs historical portfolio information for your Wealthsimple Trade account for a specified timeframe.
         Where ***time*** is one of [1d, 1w, 1m, 3m, 1y, all]: autoset to 1d.
         """
-        params = {}
         if account_id == None:
-            params["account_id"] = self.accounts(tokens=tokens).personal
+            account_id = self.account_registry.get("personal", tokens=tokens)
+        params = {"account_id": account_id}
         return requestor(
             Endpoints.GET_ACCOUNT_HISTORY,
             args={"base": self.BASE_URL, "time": time},
             params=params,
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -327,6 +556,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -339,6 +569,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -351,6 +582,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -359,9 +591,11 @@ class Wsimple:
         tokens=None,
         sec_id: Optional[str] = None,
         account_id: Optional[str] = None,
+        response_format: Optional[str] = None,
     ):
         """
         Grabs your current Wealthsimple Trade positions.
+        Where ***response_format*** is one of [box, dict, model]: autoset to the client response_format.
         """
         param = {"account_id": account_id, "security_id": sec_id}
         return requestor(
@@ -370,30 +604,51 @@ class Wsimple:
             headers=tokens[0],
             params=param,
             logger=self.logger,
+            session=self.session,
+            response_format=response_format or self.response_format,
+            model=Position,
         )
 
     #! order functions
     @_manage_tokens
-    def get_orders(self, tokens=None):
+    def get_orders(self, tokens=None, response_format: Optional[str] = None):
         """
         Grabs all current and past orders.
+        Where ***response_format*** is one of [box, dict, model]: autoset to the client response_format.
         """
         return requestor(
             Endpoints.GET_ORDERS,
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
+            response_format=response_format or self.response_format,
+            model=Order,
         )
 
     @_manage_tokens
-    def _send_order(self, payload: dict, tokens=None):
-        """ send order to wealthsimple servers """
+    def _send_order(self, payload: dict, tokens=None, exchange: Optional[str] = None):
+        """
+        send order to wealthsimple servers, a ticker as security_id is resolved first
+        on ***exchange*** (or the "exchange" key of the payload, which is not sent).
+        """
+        if "exchange" in payload:
+            payload = dict(payload)
+            exchange = payload.pop("exchange") or exchange
+        if not payload["security_id"].startswith("sec-"):
+            payload = {
+                **payload,
+                "security_id": self.security_id(
+                    payload["security_id"], tokens=tokens, exchange=exchange
+                ),
+            }
         return requestor(
             Endpoints.SEND_ORDER,
             args={"base": self.BASE_URL},
             headers=tokens[0],
             json=payload,
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -403,14 +658,17 @@ class Wsimple:
         tokens=None,
         quantity: int = 1,
         account_id: Optional[str] = None,
+        exchange: Optional[str] = None,
     ):
         """
         Places a market buy order for a security.
+        Where ***security_id*** is a security id or a ticker resolved through the security master.
+        Where ***exchange*** is the exchange name or MIC of a ticker listed on several exchanges: autoset None.
         """
         try:
             self.logger.debug("buy_market_order")
             if account_id is None:
-                account_id = self.accounts(tokens=tokens).personal
+                account_id = self.account_registry.get("personal", tokens=tokens)
             return self._send_order(
                 {
                     "security_id": security_id,
@@ -422,6 +680,7 @@ class Wsimple:
                     "account_id": account_id,
                 },
                 tokens=tokens,
+                exchange=exchange,
             )
         except InvalidAccessTokenError:
             raise InvalidAccessTokenError
@@ -435,14 +694,17 @@ class Wsimple:
         quantity: int = 1,
         time_in_force: str = "day",
         account_id: Optional[str] = None,
+        exchange: Optional[str] = None,
     ):
         """
         Places a limit buy order for a security.
+        Where ***security_id*** is a security id or a ticker resolved through the security master.
+        Where ***exchange*** is the exchange name or MIC of a ticker listed on several exchanges: autoset None.
         """
         try:
             self.logger.debug("buy_limit_order")
             if account_id is None:
-                account_id = self.accounts(tokens=tokens).personal
+                account_id = self.account_registry.get("personal", tokens=tokens)
             return self._send_order(
                 {
                     "security_id": security_id,
@@ -454,6 +716,7 @@ class Wsimple:
                     "time_in_force": time_in_force,
                 },
                 tokens=tokens,
+                exchange=exchange,
             )
         except InvalidAccessTokenError:
             raise InvalidAccessTokenError
@@ -468,14 +731,24 @@ class Wsimple:
         quantity: int = 1,
         time_in_force: str = "day",
         account_id: Optional[str] = None,
+        exchange: Optional[str] = None,
     ):
         """
         Places a stop limit buy order for a security.
+        Where ***security_id*** is a security id or a ticker resolved through the security master.
+        Where ***exchange*** is the exchange name or MIC of a ticker listed on several exchanges: autoset None.
         """
         try:
             if account_id is None:
-                account_id = self.accounts(tokens=tokens).personal
-            security = self.find_securities_by_id(security_id, tokens=tokens)
+                account_id = self.account_registry.get("personal", tokens=tokens)
+            security_id = self.security_id(
+                security_id, tokens=tokens, exchange=exchange
+            )
+            security = self.securities.by_id(security_id)
+            if security is None:
+                security = self.find_securities_by_id(
+                    security_id, tokens=tokens, response_format="dict"
+                )
             exchange = security["stock"]["primary_exchange"]
             if self.iscanadiansecurity(exchange) and (stop_price != limit_price):
                 raise TSXStopLimitPriceError
@@ -502,14 +775,17 @@ class Wsimple:
         tokens=None,
         quantity: int = 1,
         account_id: Optional[str] = None,
+        exchange: Optional[str] = None,
     ):
         """
         Places a market sell order for a security.
+        Where ***security_id*** is a security id or a ticker resolved through the security master.
+        Where ***exchange*** is the exchange name or MIC of a ticker listed on several exchanges: autoset None.
         """
         try:
             self.logger.debug("sell_market_order")
             if account_id is None:
-                account_id = self.accounts(tokens=tokens).personal
+                account_id = self.account_registry.get("personal", tokens=tokens)
             return self._send_order(
                 {
                     "security_id": security_id,
@@ -521,6 +797,7 @@ class Wsimple:
                     "account_id": account_id,
                 },
                 tokens=tokens,
+                exchange=exchange,
             )
         except InvalidAccessTokenError:
             raise InvalidAccessTokenError
@@ -534,14 +811,17 @@ class Wsimple:
         quantity: int = 1,
         time_in_force: str = "day",
         account_id: Optional[str] = None,
+        exchange: Optional[str] = None,
     ):
         """
         Places a limit sell order for a security.
+        Where ***security_id*** is a security id or a ticker resolved through the security master.
+        Where ***exchange*** is the exchange name or MIC of a ticker listed on several exchanges: autoset None.
         """
         try:
             self.logger.debug("sell_limit_order")
             if account_id is None:
-                account_id = self.accounts(tokens=tokens).personal
+                account_id = self.account_registry.get("personal", tokens=tokens)
             return self._send_order(
                 {
                     "security_id": security_id,
@@ -553,6 +833,7 @@ class Wsimple:
                     "account_id": account_id,
                 },
                 tokens=tokens,
+                exchange=exchange,
             )
         except InvalidAccessTokenError:
             raise InvalidAccessTokenError
@@ -567,14 +848,24 @@ class Wsimple:
         quantity: int = 1,
         time_in_force: str = "day",
         account_id: Optional[str] = None,
+        exchange: Optional[str] = None,
     ):
         """
         Places a limit sell order for a security.
+        Where ***security_id*** is a security id or a ticker resolved through the security master.
+        Where ***exchange*** is the exchange name or MIC of a ticker listed on several exchanges: autoset None.
         """
         try:
             if account_id is None:
-                account_id = self.accounts(tokens=tokens).personal
-            security = self.find_securities_by_id(security_id, tokens=tokens)
+                account_id = self.account_registry.get("personal", tokens=tokens)
+            security_id = self.security_id(
+                security_id, tokens=tokens, exchange=exchange
+            )
+            security = self.securities.by_id(security_id)
+            if security is None:
+                security = self.find_securities_by_id(
+                    security_id, tokens=tokens, response_format="dict"
+                )
             exchange = security["stock"]["primary_exchange"]
             if self.iscanadiansecurity(exchange) and (stop_price != limit_price):
                 raise TSXStopLimitPriceError
@@ -605,17 +896,84 @@ class Wsimple:
             args={"base": self.BASE_URL, "order_id": order_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
+        )
+
+    @_manage_tokens
+    def cancel_orders(
+        self,
+        order_ids: list,
+        tokens=None,
+        max_workers: int = 5,
+        rate_limit: Optional[float] = None,
+    ):
+        """
+        Cancels many orders concurrently.
+        Where ***order_ids*** is a list of order ids.
+        Where ***max_workers*** is the amount of cancellations in flight at once: autoset 5.
+        Where ***rate_limit*** is the maximum amount of cancellations sent per second: autoset None.
+        Returns a BatchResult (item, result, error) per order id in input order.
+        """
+        return run_batch(
+            order_ids,
+            lambda order_id: self.cancel_order(order_id, tokens=tokens),
+            max_workers=max_workers,
+            rate_limit=rate_limit,
         )
 
     @_manage_tokens
-    def cancel_all_pending_orders(self, tokens=None):
-        """ cancel all pending order """
+    def send_orders(
+        self,
+        orders: list,
+        tokens=None,
+        max_workers: int = 5,
+        rate_limit: Optional[float] = None,
+    ):
+        """
+        Sends a basket of orders concurrently.
+        Where ***orders*** is a list of order payloads (security_id, quantity, order_type,
+        order_sub_type, time_in_force, limit_price, ...), account_id defaults to your personal account
+        and an optional "exchange" picks the listing of a ticker security_id.
+        Where ***max_workers*** is the amount of orders in flight at once: autoset 5.
+        Where ***rate_limit*** is the maximum amount of orders sent per second: autoset None.
+        Returns a BatchResult (item, result, error) per order in input order.
+        """
+        orders = self._with_account(orders, tokens=tokens)
+        return run_batch(
+            orders,
+            lambda order: self._send_order(order, tokens=tokens),
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+        )
+
+    def _with_account(self, orders: list, tokens=None) -> list:
+        """ orders without an account_id get your personal account """
+        if any(order.get("account_id") is None for order in orders):
+            account_id = self.account_registry.get("personal", tokens=tokens)
+            orders = [
+                order
+                if order.get("account_id") is not None
+                else {**order, "account_id": account_id}
+                for order in orders
+            ]
+        return orders
+
+    @_manage_tokens
+    def cancel_all_pending_orders(
+        self, tokens=None, max_workers: int = 5, rate_limit: Optional[float] = None
+    ):
+        """
+        Cancel all pending order concurrently.
+        Returns a BatchResult (item, result, error) per pending order id.
+        """
         try:
-            pending = self.pending_orders(tokens=tokens)
-            result = []
-            for orders in pending:
-                result.append(self.cancel_order(orders["order_id"], tokens=tokens))
-            return result
+            pending = self.pending_orders(tokens=tokens)["result"]
+            return self.cancel_orders(
+                [order["order_id"] for order in pending],
+                tokens=tokens,
+                max_workers=max_workers,
+                rate_limit=rate_limit,
+            )
         except InvalidAccessTokenError:
             raise InvalidAccessTokenError
 
@@ -667,12 +1025,20 @@ class Wsimple:
     #! find securitites functions
     @_manage_tokens
     def find_securities(
-        self, ticker: str, tokens=None, offset=None, limit=None, fuzzy=False
+        self,
+        ticker: str,
+        tokens=None,
+        offset=None,
+        limit=None,
+        fuzzy=False,
+        exchange: Optional[str] = None,
     ):
         """
         Grabs information about the security resembled by the ticker.
         Where ***ticker*** is the ticker of the company, API will fuzzy
         match this argument and therefore multiple results can appear.
+        Without ***fuzzy*** the exact match is returned, a ticker listed on several
+        exchanges raises MethodInputError unless ***exchange*** (name or MIC) picks one.
         """
         params = {}
         if offset != None:
@@ -685,45 +1051,165 @@ class Wsimple:
             headers=tokens[0],
             params={"query": ticker, **params},
             logger=self.logger,
+            session=self.session,
         )
+        self.securities.add_response(req)
         if fuzzy:
             return req
-        else:
-            return next(filter(lambda x: x.stock.symbol == ticker, req.results), None)
+        matches = [x for x in req.results if x.stock.symbol == ticker]
+        if exchange is not None:
+            matches = [
+                x
+                for x in matches
+                if exchange.upper()
+                in (
+                    str(x.stock.get("primary_exchange")).upper(),
+                    str(x.stock.get("primary_mic")).upper(),
+                )
+            ]
+        if len(matches) > 1:
+            venues = ", ".join(str(x.stock.get("primary_exchange")) for x in matches)
+            raise MethodInputError(
+                f"{ticker} is listed on {venues}, pass an exchange to pick one"
+            )
+        return matches[0] if matches else None
 
     @_manage_tokens
     def find_securities_by_id(
         self,
         sec_id: str,
         tokens=None,
+        response_format: Optional[str] = None,
     ):
         """
         Grabs information about the security resembled by the security id.
         Where ***ticker*** is the ticker of the company. security_id
+        Where ***response_format*** is one of [box, dict, model]: autoset to the client response_format.
         """
-        return requestor(
+        res = requestor(
             Endpoints.FIND_SECURITIES_BY_ID,
             args={"base": self.BASE_URL, "security_id": sec_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
+            response_format=response_format or self.response_format,
+            model=Quote,
         )
+        self.securities.add_response(res)
+        return res
+
+    @_manage_tokens
+    def security_id(self, ticker: str, tokens=None, exchange: Optional[str] = None):
+        """
+        The security id of ***ticker***, from the security master when it is indexed.
+        Where ***exchange*** is an exchange name or MIC to pick a listing: autoset None.
+        Without ***exchange*** a ticker with several listings raises MethodInputError.
+        Values that already are security ids (sec-...) are returned as is.
+        """
+        if ticker.startswith("sec-"):
+            return ticker
+        sec_id = self.securities.id_for(ticker, exchange)
+        if sec_id is None:
+            self.find_securities(ticker, tokens=tokens, fuzzy=True)
+            sec_id = self.securities.id_for(ticker, exchange)
+        if sec_id is None:
+            raise MethodInputError(f"no security found for {ticker}")
+        return sec_id
 
     @_manage_tokens
     def find_securities_by_id_historical(
-        self, sec_id: str, tokens=None, time: str = "1d", mic: str = "XNAS"
+        self,
+        sec_id: str,
+        tokens=None,
+        time: str = "1d",
+        mic: str = "XNAS",
+        response_format: Optional[str] = None,
+        frame: Optional[str] = None,
     ):
         """
         Grabs historical information about the security by the security id in a specified timeframe.
         Where ***time*** is the timeframe one of [1d, 1w, 1m, 3m, 1y, all]: autoset "1d".
         Where ***mic*** is the Market Identifier Code for the exchange: autoset "XNAS"
+        Where ***response_format*** is "dict" to skip the Box conversion: autoset to the client response_format.
+        Where ***frame*** returns the series as columns instead, one of [array, numpy, pandas]: autoset None.
         """
-        return requestor(
+        res = requestor(
             Endpoints.FIND_SECURITIES_HISTORY,
             args={"base": self.BASE_URL, "time": time, "security_id": sec_id},
             headers=tokens[0],
             params={"mic": mic},
             logger=self.logger,
+            session=self.session,
+            response_format="dict" if frame else response_format or self.response_format,
         )
+        if frame:
+            return to_frame(res, frame, security_id=sec_id)
+        return res
+
+    @_manage_tokens
+    def bulk_history(
+        self,
+        sec_ids: list,
+        tokens=None,
+        time: Union[str, list] = "1d",
+        mic: Union[str, dict] = "XNAS",
+        max_workers: int = 5,
+        rate_limit: Optional[float] = 5,
+        retries: Optional[int] = None,
+        path: Optional[str] = None,
+    ):
+        """
+        Downloads the historical quotes of many securities concurrently and yields
+        a BatchResult (item, result, error) as soon as each download completes,
+        the item is a (sec_id, time) pair and the result a HistoricalFrame.
+        Where ***time*** is a timeframe or a list of timeframes fetched for every security: autoset "1d".
+        Where ***mic*** is a Market Identifier Code or a dict of sec_id to mic: autoset "XNAS".
+        Where ***max_workers*** is the amount of downloads in flight at once: autoset 5.
+        Where ***rate_limit*** is the maximum amount of requests sent per second: autoset 5.
+        Where ***retries*** is how often a download failing with a server error is retried on top
+        of the session RetryPolicy: autoset 0 when the session retries requests, 3 otherwise.
+        Where ***path*** is a .npz, .parquet, .arrow or .feather file written with every
+        downloaded frame once the iteration is done, keyed "sec_id/time", checked before
+        any download starts: autoset None.
+        """
+        if path is not None:
+            check_frames_path(path)
+        if retries is None:
+            retries = 0 if getattr(self.session, "retry", None) is not None else 3
+        return self._bulk_history(
+            sec_ids, tokens, time, mic, max_workers, rate_limit, retries, path
+        )
+
+    def _bulk_history(
+        self, sec_ids, tokens, time, mic, max_workers, rate_limit, retries, path
+    ):
+        times = [time] if isinstance(time, str) else list(time)
+        items = [(sec_id, timeframe) for sec_id in sec_ids for timeframe in times]
+
+        def download(item):
+            sec_id, timeframe = item
+            return self.find_securities_by_id_historical(
+                sec_id,
+                tokens=tokens,
+                time=timeframe,
+                mic=mic.get(sec_id, "XNAS") if isinstance(mic, dict) else mic,
+                frame="array",
+            )
+
+        frames = {}
+        for result in iter_batch(
+            items,
+            download,
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+            retries=retries,
+            retry_on=(WealthsimpleServerError,),
+        ):
+            if path is not None and result.ok:
+                frames["{}/{}".format(*result.item)] = result.result
+            yield result
+        if path is not None:
+            write_frames(frames, path)
 
     #! activities functions
     @_manage_tokens
@@ -734,6 +1220,7 @@ class Wsimple:
         type: Union[str, list] = "all",
         sec_id: Optional[str] = None,
         account_id: Union[str, list] = None,
+        response_format: Optional[str] = None,
     ):
         """
         Grabs the 20 most recent activities on under your Wealthsimple Trade account.
@@ -744,6 +1231,7 @@ class Wsimple:
         ] autoset to "all".
         Where ***limit*** is the limitation of the response has to be less than 100: autoset 20.
         !Wealthsimple Servers will default to trade account if account_id = None
+        Where ***response_format*** is one of [box, dict, model]: autoset to the client response_format.
         """
         params = {}
         if not limit is None:
@@ -760,13 +1248,19 @@ class Wsimple:
             headers=tokens[0],
             params=params,
             logger=self.logger,
+            session=self.session,
+            response_format=response_format or self.response_format,
+            model=Activity,
         )
 
     @_manage_tokens
-    def get_activities_bookmark(self, bookmark: str, tokens=None):
+    def get_activities_bookmark(
+        self, bookmark: str, tokens=None, response_format: Optional[str] = None
+    ):
         """
         Provides the last 20 activities on the Wealthsimple Trade based on the bookmark.
         Where ***bookmark*** is the bookmark id.
+        Where ***response_format*** is one of [box, dict, model]: autoset to the client response_format.
         """
         params = {"bookmark": bookmark}
         return requestor(
@@ -775,7 +1269,69 @@ class Wsimple:
             headers=tokens[0],
             params=params,
             logger=self.logger,
+            session=self.session,
+            response_format=response_format or self.response_format,
+            model=Activity,
+        )
+
+    def iter_activity_pages(
+        self,
+        tokens=None,
+        type: Union[str, list] = "all",
+        since: Optional[datetime] = None,
+        sec_id: Optional[str] = None,
+        account_id: Union[str, list] = None,
+        limit: int = 99,
+        response_format: Optional[str] = None,
+    ):
+        """
+        Lazily walks every page of activities by following the bookmarks, newest first.
+        The next page is fetched in the background while the current one is processed.
+        Where ***since*** stops the walk at the first activity that occurred before it: autoset None.
+        Where ***limit*** is the page size, has to be less than 100: autoset 99.
+        Other arguments are the same as ***get_activities***.
+        """
+        since = _as_utc(since) if since is not None else None
+        page = self._fan_out_pool.submit(
+            self.get_activities,
+            tokens=tokens,
+            limit=limit,
+            type=type,
+            sec_id=sec_id,
+            account_id=account_id,
+            response_format=response_format,
         )
+        while page is not None:
+            response = page.result()
+            results = response["results"]
+            bookmark = response.get("bookmark")
+            page = None
+            if results and bookmark:
+                page = self._fan_out_pool.submit(
+                    self.get_activities_bookmark,
+                    bookmark,
+                    tokens=tokens,
+                    response_format=response_format,
+                )
+            if since is not None:
+                for index, activity in enumerate(results):
+                    if _parse_timestamp(activity["occurred_at"]) < since:
+                        if page is not None:
+                            page.cancel()
+                        if index:
+                            yield results[:index]
+                        return
+            if results:
+                yield results
+
+    def iter_activities(self, tokens=None, **kwargs):
+        """
+        Lazily yields every activity by following the bookmarks, newest first.
+        Takes the same arguments as ***iter_activity_pages***, e.g.
+        iter_activities(type="dividend", since=datetime(2020, 1, 1), account_id=...)
+        """
+        for page in self.iter_activity_pages(tokens=tokens, **kwargs):
+            yield from page
 
     #! withdrawal functions
     @_manage_tokens
@@ -796,7 +1352,7 @@ class Wsimple:
         if bank_account_id == None:
             bank_account_id = self.get_bank_accounts(tokens=tokens)["results"][0]["id"]
         if account_id == None:
-            account_id = self.accounts(tokens=tokens).personal
+            account_id = self.account_registry.get("personal", tokens=tokens)
         person = self.get_me(tokens=tokens)
         payload = {
             "bank_account_id": str(bank_account_id),
@@ -811,6 +1367,7 @@ class Wsimple:
             headers=tokens[0],
             data=payload,
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -824,6 +1381,7 @@ class Wsimple:
             args={"base": self.BASE_URL, "funds_transfer_id": funds_transfer_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -836,6 +1394,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -848,6 +1407,7 @@ class Wsimple:
             args={"base": self.BASE_URL, "funds_transfer_id": funds_transfer_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     #! deposits functions
@@ -869,7 +1429,7 @@ class Wsimple:
         if bank_account_id == None:
             bank_account_id = self.get_bank_accounts(tokens=tokens)["results"][0]["id"]
         if account_id == None:
-            account_id = self.accounts(tokens=tokens).personal
+            account_id = self.account_registry.get("personal", tokens=tokens)
         person = self.get_me(tokens=tokens)
         payload = {
             "client_id": str(person["id"]),
@@ -884,6 +1444,7 @@ class Wsimple:
             headers=tokens[0],
             data=payload,
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -897,6 +1458,7 @@ class Wsimple:
             args={"base": self.BASE_URL, "funds_transfer_id": funds_transfer_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -909,6 +1471,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -921,6 +1484,7 @@ class Wsimple:
             args={"base": self.BASE_URL, "funds_transfer_id": funds_transfer_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     #! market related functions
@@ -934,23 +1498,19 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
     def get_market_hours(self, exchange: str, tokens=None):
         """
-        Get all market data about a specific exchange.
-        Where ***exchange*** is the exchange name.
+        Get all market data about a specific exchange, from the daily market calendar (self.markets).
+        Where ***exchange*** is the exchange name or MIC.
         """
         try:
             self.logger.debug("get_market_hours")
-            if exchange in list(self.exh_to_mic.keys()):
-                all_markets = self.get_all_markets(tokens=tokens)["results"]
-                for market in all_markets:
-                    if market["exchange_name"] == exchange:
-                        return market
-            else:
-                return {}
+            market = self.markets.market(exchange, tokens=tokens)
+            return {} if market is None else market
         except InvalidAccessTokenError:
             raise InvalidAccessTokenError
 
@@ -965,6 +1525,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -978,6 +1539,7 @@ class Wsimple:
             args={"base": self.BASE_URL, "security_id": sec_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -991,6 +1553,7 @@ class Wsimple:
             args={"base": self.BASE_URL, "security_id": sec_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     #! exchange functions
@@ -1004,15 +1567,41 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
     def exchange_to(self, value: Union[int, float, str], to: str, tokens=None) -> None:
-        rates = self.get_exchange_rate(tokens=tokens)["USD"]
         if to == "USD":
-            return float(value) / rates["buy_rate"]
+            return self.fx.convert([value], "CAD", "USD", tokens=tokens)[0]
         elif to == "CAD":
-            return float(value) * rates["sell_rate"]
+            return self.fx.convert([value], "USD", "CAD", tokens=tokens)[0]
+
+    @_manage_tokens
+    def convert_currency(
+        self, amounts, currencies: Union[str, List[str]], to: str = "CAD", tokens=None
+    ):
+        """
+        Convert a batch of amounts into ***to*** against the cached forex rates, one
+        GET_EXCHANGE_RATE at most per fx_max_age whatever the batch size.
+        Where ***amounts*** is a list/array of numbers or a numpy array.
+        Where ***currencies*** is the currency of every amount, or one currency for all of them.
+        """
+        return self.fx.convert(amounts, currencies, to, tokens=tokens)
+
+    @_manage_tokens
+    def positions_value(
+        self, tokens=None, account_id: Optional[str] = None, to: str = "CAD"
+    ) -> float:
+        """
+        Market value of every position in ***to***: one GET_POSITONS plus the cached forex rates.
+        """
+        if account_id == None:
+            account_id = self.account_registry.get("personal", tokens=tokens)
+        positions = self.get_positions(
+            tokens=tokens, account_id=account_id, response_format="dict"
+        )["results"]
+        return self.fx.total(positions, to, tokens=tokens)
 
     #! fact-sheet functions
     @_manage_tokens
@@ -1028,6 +1617,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     #! securities groups functions
@@ -1044,6 +1634,7 @@ class Wsimple:
             headers=tokens[0],
             params={"type": "losers", "limit": limit, "offset": offset},
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1059,6 +1650,7 @@ class Wsimple:
             headers=tokens[0],
             params={"type": "gainers", "limit": limit, "offset": offset},
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1073,6 +1665,7 @@ class Wsimple:
             headers=tokens[0],
             params={"type": "most_active", "limit": limit},
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1090,6 +1683,7 @@ class Wsimple:
             headers=tokens[0],
             params={"limit": limit, "offset": offset},
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1102,6 +1696,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1119,13 +1714,16 @@ class Wsimple:
         Where ***offset*** is the displacement between the selected offset and the beginning.
         Where ***limit*** is the amount of response you want from the request.
         """
-        return requestor(
+        res = requestor(
             Endpoints.GET_SECURITIES_IN_GROUPS,
             args={"base": self.BASE_URL, "group_id": group_id},
             headers=tokens[0],
             params={"limit": limit, "offset": offset, "filter_type": filter_type},
             logger=self.logger,
+            session=self.session,
         )
+        self.securities.add_response(res)
+        return res
 
     @_manage_tokens
     def get_all_securities_groups(
@@ -1137,13 +1735,16 @@ class Wsimple:
         Where ***limit*** is the limitation of the response, (1 <= limit < 99): autoset to 25
         Where ***sort_order*** is order of the results and can be ["asc", "desc"]: autoset to "desc"
         """
-        return requestor(
+        res = requestor(
             Endpoints.GET_ALL_GROUPS,
             args={"base": self.BASE_URL},
             headers=tokens[0],
             params={"offset": offset, "limit": limit, "sort_order": order},
             logger=self.logger,
+            session=self.session,
         )
+        self.securities.add_response(res)
+        return res
 
     #! mobile dashboard functions
     @_manage_tokens
@@ -1156,6 +1757,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     #! global alerts
@@ -1169,6 +1771,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1181,6 +1784,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     #! internal transfers
@@ -1196,6 +1800,7 @@ class Wsimple:
             headers=tokens[0],
             response_list=True,
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1218,6 +1823,7 @@ class Wsimple:
             headers=tokens[0],
             data=payload,
             logger=self.logger,
+            session=self.session,
         )
 
     #! tax-documents
@@ -1232,6 +1838,7 @@ class Wsimple:
             headers=tokens[0],
             response_list=True,
             logger=self.logger,
+            session=self.session,
         )
 
     #! monthly-statements
@@ -1245,6 +1852,7 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1258,6 +1866,7 @@ class Wsimple:
             args={"base": self.BASE_URL, "pdf_statement_id": pdf_statement_id},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
 
     @_manage_tokens
@@ -1295,12 +1904,9 @@ class Wsimple:
             args={"base": self.BASE_URL},
             headers=tokens[0],
             logger=self.logger,
+            session=self.session,
         )
-        return (
-            "wss://trade-service.wealthsimple.com/websocket?ticket={}&version=2".format(
-                res.ticket
-            )
-        )
+        return self.WEBSOCKET_URL.format(res.ticket)
 
     def is_operational(self):
         """checks if wealthsimple platform is currently working
@@ -1315,12 +1921,21 @@ class Wsimple:
         else:     
             raise WealthsimpleDownException(f"It seems that Wealthsimple is down ( {indicator} , {description})")
 
+    def _probe_operational(self) -> bool:
+        """ CircuitBreaker probe: True when the status page reports no incident """
+        try:
+            return self.is_operational()
+        except WealthsimpleDownException:
+            return False
+
     #! functions after this point are not core to the API
     @_manage_tokens
     def test_endpoint(self, data, tokens=None):
         """
         function for testing new endpoints
         #"""
+        import requests
+
         f = requests.post(
             url="{}quotes".format(self.BASE_URL),
             headers=tokens[0],
@@ -1331,109 +1946,188 @@ class Wsimple:
         print(f.json())
 
     @_manage_tokens
-    def settings(self, tokens=None):
+    def settings(self, tokens=None, timeout: Optional[float] = None, partial=False):
         """
         Get settings data needed for settings page.
+        Where ***timeout*** is the seconds each sub-request is given: autoset None.
+        Where ***partial*** returns successful parts plus an "errors" dict instead of raising: autoset False.
         """
         self.logger.debug("starting settings")
         try:
-            return {
-                "me": self.get_me(tokens=tokens),
-                "person": self.get_person(tokens=tokens),
-                "bank_account": self.get_bank_accounts(tokens=tokens),
-                "exchange_rate": self.get_exchange_rate(tokens=tokens),
-                "ws_current_operational_status": self.current_status(),
-            }
+            return fan_out(
+                self._fan_out_pool,
+                {
+                    "me": lambda: self.get_me(tokens=tokens),
+                    "person": lambda: self.get_person(tokens=tokens),
+                    "bank_account": lambda: self.get_bank_accounts(tokens=tokens),
+                    "exchange_rate": lambda: self.get_exchange_rate(tokens=tokens),
+                    "ws_current_operational_status": self.current_status,
+                },
+                timeout=timeout,
+                partial=partial,
+            )
         except InvalidAccessTokenError:
             self.logger.debug("settings InvalidAccessTokenError")
             raise InvalidAccessTokenError
 
     @_manage_tokens
-    def stock(self, sec_id: str, tokens=None, time: str = "1m"):
+    def stock(
+        self,
+        sec_id: str,
+        tokens=None,
+        time: str = "1m",
+        timeout: Optional[float] = None,
+        partial=False,
+    ):
         """
         Get security data needed for stock search pages.
+        Where ***timeout*** is the seconds each sub-request is given: autoset None.
+        Where ***partial*** returns successful parts plus an "errors" dict instead of raising: autoset False.
         """
         self.logger.debug("starting stock {}".format(sec_id))
         try:
-            info = self.find_securities_by_id(sec_id, tokens=tokens)
-            return {
-                "sparkline": self.find_securities_by_id_historical(
-                    sec_id, time=time, tokens=tokens
-                ),
-                "security_info": info,
-                "position": self.public_find_securities_news(info["stock"]["symbol"]),
-                "news": self.get_positions(tokens=tokens),
-            }
+            result = fan_out(
+                self._fan_out_pool,
+                {
+                    "sparkline": lambda: self.find_securities_by_id_historical(
+                        sec_id, time=time, tokens=tokens
+                    ),
+                    "security_info": lambda: self.find_securities_by_id(
+                        sec_id, tokens=tokens
+                    ),
+                    "position": lambda: self.get_positions(tokens=tokens),
+                },
+                timeout=timeout,
+                partial=partial,
+            )
+            # news is keyed by symbol so it has to wait for the security info
+            info = result["security_info"]
+            if info is None:
+                result["news"] = None
+                result["errors"]["news"] = result["errors"]["security_info"]
+            else:
+                news = fan_out(
+                    self._fan_out_pool,
+                    {
+                        "news": lambda: self.public_find_securities_news(
+                            info["stock"]["symbol"]
+                        )
+                    },
+                    timeout=timeout,
+                    partial=partial,
+                )
+                if partial:
+                    result["errors"].update(news.pop("errors"))
+                result.update(news)
+            return result
         except InvalidAccessTokenError:
             self.logger.error("stock InvalidAccessTokenError")
             raise InvalidAccessTokenError
 
     @_manage_tokens
-    def search_page(self, tokens=None):
+    def search_page(self, tokens=None, timeout: Optional[float] = None, partial=False):
         """
         Get groups need for search page
+        Where ***timeout*** is the seconds each sub-request is given: autoset None.
+        Where ***partial*** returns successful parts plus an "errors" dict instead of raising: autoset False.
         """
         try:
-            return {
-                "featured_security_groups": self.get_featured_security_groups(
-                    tokens=tokens
-                ),
-                "most_watched": self.get_top_losers_securities(tokens=tokens, limit=5),
-                "most_active": self.get_top_gainers_securities(tokens=tokens, limit=5),
-                "top_gainers": self.get_most_active_securities(tokens=tokens, limit=5),
-                "top_losers": self.get_most_watched_securities(tokens=tokens, limit=5),
-            }
+            return fan_out(
+                self._fan_out_pool,
+                {
+                    "featured_security_groups": lambda: self.get_featured_security_groups(
+                        tokens=tokens
+                    ),
+                    "most_watched": lambda: self.get_top_losers_securities(
+                        tokens=tokens, limit=5
+                    ),
+                    "most_active": lambda: self.get_top_gainers_securities(
+                        tokens=tokens, limit=5
+                    ),
+                    "top_gainers": lambda: self.get_most_active_securities(
+                        tokens=tokens, limit=5
+                    ),
+                    "top_losers": lambda: self.get_most_watched_securities(
+                        tokens=tokens, limit=5
+                    ),
+                },
+                timeout=timeout,
+                partial=partial,
+            )
         except InvalidAccessTokenError:
             self.logger.error("search_page InvalidAccessTokenError")
             raise InvalidAccessTokenError
 
     @_manage_tokens
-    def dashboard(self, tokens=None):
+    def dashboard(self, tokens=None, timeout: Optional[float] = None, partial=False):
         """
         Get dashboard page needed for home page.
+        Where ***timeout*** is the seconds each sub-request is given: autoset None.
+        Where ***partial*** returns successful parts plus an "errors" dict instead of raising: autoset False.
         """
         self.logger.debug("calling dashboard")
         try:
-            mobile_dashboard = self.get_mobile_dashboard(tokens=tokens)
-            account_data = self.get_historical_portfolio_data(tokens=tokens)
-
-            account = mobile_dashboard["accounts"][0]
-            watchlist = mobile_dashboard["watchlist"]
-            positions = mobile_dashboard["positions"]
-            previous_amount = account_data["previous_close_net_liquidation_value"][
-                "amount"
-            ]
-            total_value = account_data["results"][-1]["value"]
-            account_value_graph = account_data["results"]
-            account_change = round(total_value["amount"] - previous_amount, 2)
-            account_change_percentage = round(
-                (account_change / previous_amount) * 100, 2
-            )
-            return {
-                "available_to_trade": {
-                    "amount": account["buying_power"]["amount"],
-                    "currency": account["buying_power"]["currency"],
-                },
-                "account_value": {
-                    "amount": total_value["amount"],
-                    "currency": total_value["currency"],
-                },
-                "net_deposits": {
-                    "amount": account["net_deposits"]["amount"],
-                    "currency": account["net_deposits"]["currency"],
-                },
-                "available_to_withdraw": {
-                    "amount": account["available_to_withdraw"]["amount"],
-                    "currency": account["available_to_withdraw"]["currency"],
-                },
-                "account_change": {
-                    "amount": account_change,
-                    "percentage": account_change_percentage,
+            data = fan_out(
+                self._fan_out_pool,
+                {
+                    "mobile_dashboard": lambda: self.get_mobile_dashboard(
+                        tokens=tokens
+                    ),
+                    "account_data": lambda: self.get_historical_portfolio_data(
+                        tokens=tokens
+                    ),
                 },
-                "account_value_graph": {"table": account_value_graph},
-                "account_positions": {"table": positions},
-                "account_watchlist": {"table": watchlist},
-            }
+                timeout=timeout,
+                partial=partial,
+            )
+            result = {}
+            mobile_dashboard = data["mobile_dashboard"]
+            account_data = data["account_data"]
+            if mobile_dashboard is not None:
+                account = mobile_dashboard["accounts"][0]
+                result.update(
+                    {
+                        "available_to_trade": {
+                            "amount": account["buying_power"]["amount"],
+                            "currency": account["buying_power"]["currency"],
+                        },
+                        "net_deposits": {
+                            "amount": account["net_deposits"]["amount"],
+                            "currency": account["net_deposits"]["currency"],
+                        },
+                        "available_to_withdraw": {
+                            "amount": account["available_to_withdraw"]["amount"],
+                            "currency": account["available_to_withdraw"]["currency"],
+                        },
+                        "account_positions": {"table": mobile_dashboard["positions"]},
+                        "account_watchlist": {"table": mobile_dashboard["watchlist"]},
+                    }
+                )
+            if account_data is not None:
+                previous_amount = account_data["previous_close_net_liquidation_value"][
+                    "amount"
+                ]
+                total_value = account_data["results"][-1]["value"]
+                account_change = round(total_value["amount"] - previous_amount, 2)
+                account_change_percentage = round(
+                    (account_change / previous_amount) * 100, 2
+                )
+                result.update(
+                    {
+                        "account_value": {
+                            "amount": total_value["amount"],
+                            "currency": total_value["currency"],
+                        },
+                        "account_change": {
+                            "amount": account_change,
+                            "percentage": account_change_percentage,
+                        },
+                        "account_value_graph": {"table": account_data["results"]},
+                    }
+                )
+            if partial:
+                result["errors"] = data["errors"]
+            return result
         except InvalidAccessTokenError:
             self.logger.error("dashboard InvalidAccessTokenError")
             raise InvalidAccessTokenError
@@ -1449,20 +2143,29 @@ class Wsimple:
             Endpoints.PUBLIC_GET_SECURITIES_BY_TICKER,
             args={"base": self.BASE_PUBLIC_URL, "ticker": ticker},
             logger=self.logger,
+            session=self.session,
         )
 
-    def public_find_securities_by_ticker_historical(self, ticker, time):
+    def public_find_securities_by_ticker_historical(
+        self, ticker, time, frame: Optional[str] = None
+    ):
         """
         Get a company historical data based on a time.
         Where ***ticker*** is the ticker of the company or ETF. Ex. AMZN, APPL, GOOGL, SPY.
         Where ***time*** is ("1d", "1w", "1m", "3m", "1y"): DOES NOT INCLUDE ("all").
+        Where ***frame*** returns the series as columns instead, one of [array, numpy, pandas]: autoset None.
         !May not work on smaller companies or ETFs.
         """
-        return requestor(
+        res = requestor(
             Endpoints.PUBLIC_GET_SECURITIES_HISTORICAL,
             args={"base": self.BASE_PUBLIC_URL, "ticker": ticker, "time": time},
             logger=self.logger,
+            session=self.session,
+            response_format="dict" if frame else "box",
         )
+        if frame:
+            return to_frame(res, frame)
+        return res
 
     def public_top_traded(self, offset: int = 0, limit: int = 5):
         """
@@ -1475,6 +2178,7 @@ class Wsimple:
             args={"base": self.BASE_PUBLIC_URL},
             params={"offset": offset, "limit": limit},
             logger=self.logger,
+            session=self.session,
         )
 
     def public_find_securities_news(self, ticker):
@@ -1487,6 +2191,7 @@ class Wsimple:
             Endpoints.PUBLIC_GET_SECURITIES_NEWS,
             args={"base": self.BASE_PUBLIC_URL, "ticker": ticker},
             logger=self.logger,
+            session=self.session,
         )
 
     #! public prefix functions: wealthsimple operational status
@@ -1507,6 +2212,7 @@ class Wsimple:
             args={"base": self.BASE_STATUS_URL},
             request_status=True,
             logger=self.logger,
+            session=self.session,
         )
 
     def current_status(self):
@@ -1519,16 +2225,20 @@ class Wsimple:
             args={"base": self.BASE_STATUS_URL},
             request_status=True,
             logger=self.logger,
+            session=self.session,
         )
 
-    def historical_status(self):
+    def historical_status(self, response_format: Optional[str] = None):
         """
         Get all previous history status/incidents of wealthsimple trade.
         the data is in body(content), data could be large.
+        Where ***response_format*** is "dict" to skip the Box conversion: autoset to the client response_format.
         """
         return requestor(
             Endpoints.GET_HISTORICAL_STATUS,
             args={"base": self.BASE_STATUS_URL},
             request_status=True,
             logger=self.logger,
+            session=self.session,
+            response_format=response_format or self.response_format,
         )
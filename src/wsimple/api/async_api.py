@@ -0,0 +1,316 @@
+"""
+Project Name: Wsimple
+File Name: api/async_api.py
+**File: asyncio access point to API**
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Callable, Optional
+
+from .api import Wsimple
+from .concurrency import BatchResult
+from .endpoints import Endpoints
+from .ratelimit import RateLimiter
+
+# every Wsimple endpoint exposed as a coroutine on AsyncWsimple
+ASYNC_METHODS = (
+    "refresh_token",
+    # account related functions
+    "get_accounts",
+    "get_account",
+    "accounts",
+    "get_historical_portfolio_data",
+    "get_me",
+    "get_person",
+    "get_bank_accounts",
+    "get_positions",
+    # order functions
+    "get_orders",
+    "market_buy_order",
+    "limit_buy_order",
+    "stop_limit_buy_order",
+    "market_sell_order",
+    "limit_sell_order",
+    "stop_limit_sell_order",
+    "cancel_order",
+    "pending_orders",
+    "cancelled_orders",
+    "filled_orders",
+    # find securitites functions
+    "find_securities",
+    "find_securities_by_id",
+    "find_securities_by_id_historical",
+    "security_id",
+    # activities functions
+    "get_activities",
+    "get_activities_bookmark",
+    # withdrawal and deposits functions
+    "make_withdrawal",
+    "get_withdrawal",
+    "list_withdrawals",
+    "delete_withdrawal",
+    "make_deposit",
+    "get_deposit",
+    "list_deposits",
+    "delete_deposit",
+    # market, watchlist and exchange functions
+    "get_all_markets",
+    "get_market_hours",
+    "get_watchlist",
+    "add_watchlist",
+    "delete_watchlist",
+    "get_exchange_rate",
+    "exchange_to",
+    "convert_currency",
+    "positions_value",
+    "get_fact_sheets",
+    # securities groups functions
+    "get_top_losers_securities",
+    "get_top_gainers_securities",
+    "get_most_active_securities",
+    "get_most_watched_securities",
+    "get_featured_security_groups",
+    "get_securities_in_groups",
+    "get_all_securities_groups",
+    # dashboard, alerts, transfers and documents
+    "get_mobile_dashboard",
+    "get_global_alerts",
+    "get_user_alerts",
+    "get_supported_internal_transfers",
+    "create_internal_transfers",
+    "get_tax_documents",
+    "get_monthly_statements",
+    "get_monthly_statements_url",
+    "get_cleaned_monthly_statements",
+    "get_websocket_uri",
+    "is_operational",
+    # page functions
+    "settings",
+    "stock",
+    "search_page",
+    "dashboard",
+    # public prefix functions
+    "public_find_securities_by_ticker",
+    "public_find_securities_by_ticker_historical",
+    "public_top_traded",
+    "public_find_securities_news",
+    "summary_status",
+    "current_status",
+    "historical_status",
+)
+
+# methods whose request waits for the session RateLimiter on the event loop
+# (acquire_async) instead of sleeping in an executor thread
+PACED_METHODS = {
+    "market_buy_order": Endpoints.SEND_ORDER,
+    "limit_buy_order": Endpoints.SEND_ORDER,
+    "stop_limit_buy_order": Endpoints.SEND_ORDER,
+    "market_sell_order": Endpoints.SEND_ORDER,
+    "limit_sell_order": Endpoints.SEND_ORDER,
+    "stop_limit_sell_order": Endpoints.SEND_ORDER,
+    "cancel_order": Endpoints.CANCEL_ORDER,
+}
+
+
+def _to_async(name: str):
+    method = getattr(Wsimple, name)
+
+    endpoint = PACED_METHODS.get(name)
+
+    @wraps(method)
+    async def wrap_to_async(self, *args, **kwargs):
+        if endpoint is not None:
+            return await self._run_paced(
+                endpoint, getattr(self.wsimple, name), *args, **kwargs
+            )
+        return await self._run(getattr(self.wsimple, name), *args, **kwargs)
+
+    return wrap_to_async
+
+
+class AsyncWsimple:
+    """
+    AsyncWsimple mirrors every Wsimple endpoint as a coroutine.
+    It is a thread-offload facade, not a native async client: every call runs the
+    blocking Wsimple method on a ThreadPoolExecutor, so at most ***max_workers***
+    requests are in flight and further coroutines wait for a free thread.
+    Wealthsimple sits behind cloudflare and only the cloudscraper session can
+    pass its challenge, which is why requests go through the pooled session of the
+    wrapped Wsimple instance. Token management, the connection pool and cookies are
+    shared with that instance.
+    Where ***max_workers*** is the number of executor threads: autoset the session pool_size.
+    """
+
+    def __init__(self, wsimple: Wsimple, max_workers: Optional[int] = None):
+        self.wsimple = wsimple
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or wsimple.session.pool_size,
+            thread_name_prefix="wsimple",
+        )
+
+    @classmethod
+    async def login(cls, email: str, password: str, max_workers=None, **kwargs):
+        """
+        constructor: login without blocking the event loop
+        """
+        loop = asyncio.get_running_loop()
+        wsimple = await loop.run_in_executor(
+            None, partial(Wsimple, email, password, **kwargs)
+        )
+        return cls(wsimple, max_workers=max_workers)
+
+    @classmethod
+    def oauth_login(cls, token_dict, verbose=False, max_workers=None):
+        """
+        constructor: login with a predefined list of tokens:
+        """
+        return cls(Wsimple.oauth_login(token_dict, verbose=verbose), max_workers)
+
+    @classmethod
+    def public(cls, verbose=False, max_workers=None):
+        """
+        constructor: Use AsyncWsimple.public functions without an wealthsimple account:
+        """
+        return cls(Wsimple.public(verbose=verbose), max_workers=max_workers)
+
+    async def _run(self, f, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(f, *args, **kwargs))
+
+    async def _run_paced(self, endpoint: Endpoints, f, *args, **kwargs):
+        """ wait for the limiter on the loop, then run ***f*** with its token prepaid """
+        limiter = getattr(self.wsimple.session, "limiter", None)
+        if limiter is None:
+            return await self._run(f, *args, **kwargs)
+        await limiter.acquire_async(endpoint)
+
+        def call():
+            with limiter.prepaid(endpoint):
+                return f(*args, **kwargs)
+
+        return await self._run(call)
+
+    async def _batch(
+        self,
+        items: list,
+        endpoint: Endpoints,
+        call: Callable,
+        max_workers: int,
+        rate_limit: Optional[float],
+    ):
+        semaphore = asyncio.Semaphore(max_workers)
+        pacer = RateLimiter({endpoint: (rate_limit, 1)}, None) if rate_limit else None
+
+        async def run_item(item):
+            async with semaphore:
+                if pacer is not None:
+                    await pacer.acquire_async(endpoint)
+                try:
+                    return BatchResult(
+                        item, result=await self._run_paced(endpoint, call, item)
+                    )
+                except Exception as error:
+                    return BatchResult(item, error=error)
+
+        return list(await asyncio.gather(*map(run_item, items)))
+
+    async def send_orders(
+        self,
+        orders: list,
+        tokens=None,
+        max_workers: int = 5,
+        rate_limit: Optional[float] = None,
+    ):
+        """
+        Sends a basket of orders concurrently, see Wsimple.send_orders.
+        Rate limits are waited for on the event loop, not in executor threads.
+        """
+        orders = await self._run(self.wsimple._with_account, orders, tokens=tokens)
+        return await self._batch(
+            orders,
+            Endpoints.SEND_ORDER,
+            lambda order: self.wsimple._send_order(order, tokens=tokens),
+            max_workers,
+            rate_limit,
+        )
+
+    async def cancel_orders(
+        self,
+        order_ids: list,
+        tokens=None,
+        max_workers: int = 5,
+        rate_limit: Optional[float] = None,
+    ):
+        """
+        Cancels many orders concurrently, see Wsimple.cancel_orders.
+        """
+        return await self._batch(
+            order_ids,
+            Endpoints.CANCEL_ORDER,
+            lambda order_id: self.wsimple.cancel_order(order_id, tokens=tokens),
+            max_workers,
+            rate_limit,
+        )
+
+    async def cancel_all_pending_orders(
+        self, tokens=None, max_workers: int = 5, rate_limit: Optional[float] = None
+    ):
+        """
+        Cancel all pending order concurrently, see Wsimple.cancel_all_pending_orders.
+        """
+        pending = (await self.pending_orders(tokens=tokens))["result"]
+        return await self.cancel_orders(
+            [order["order_id"] for order in pending],
+            tokens=tokens,
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+        )
+
+    async def iter_activity_pages(self, tokens=None, **kwargs):
+        """
+        Async iterator over every page of activities, see Wsimple.iter_activity_pages.
+        """
+        pages = self.wsimple.iter_activity_pages(tokens=tokens, **kwargs)
+        while True:
+            page = await self._run(next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    async def iter_activities(self, tokens=None, **kwargs):
+        """
+        Async iterator over every activity, see Wsimple.iter_activities.
+        """
+        async for page in self.iter_activity_pages(tokens=tokens, **kwargs):
+            for activity in page:
+                yield activity
+
+    async def bulk_history(self, sec_ids: list, tokens=None, **kwargs):
+        """
+        Async iterator over the BatchResult of every download, see Wsimple.bulk_history.
+        """
+        results = self.wsimple.bulk_history(sec_ids, tokens=tokens, **kwargs)
+        while True:
+            result = await self._run(next, results, None)
+            if result is None:
+                return
+            yield result
+
+    async def close(self):
+        """
+        Close the executor and all pooled connections.
+        """
+        self._executor.shutdown(wait=False)
+        self.wsimple.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+for _name in ASYNC_METHODS:
+    setattr(AsyncWsimple, _name, _to_async(_name))
+del _name
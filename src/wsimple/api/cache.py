@@ -0,0 +1,182 @@
+"""
+Project Name: Wsimple
+File Name: api/cache.py
+**File: TTL response caches for reference-data endpoints**
+"""
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .endpoints import Endpoints
+
+# seconds a response stays fresh, endpoints missing here are never cached.
+# keys ignore the access token so only give a ttl to data that is the same for every user.
+# FIND_SECURITIES_BY_ID carries the live quote, pass it in ***ttls*** to accept stale prices.
+DEFAULT_TTLS = {
+    Endpoints.GET_ALL_MARKETS: 60 * 60,
+    Endpoints.GET_EXCHANGE_RATE: 60,
+    Endpoints.GET_FEATURED: 60 * 60,
+    Endpoints.GET_ALL_GROUPS: 60 * 60,
+    Endpoints.GET_SECURITIES_IN_GROUPS: 15 * 60,
+}
+
+
+class ResponseCache(ABC):
+    """
+    ResponseCache: base of the response caches used by requestor.
+    Holds the raw response body of GET requests for a per endpoint ***ttls*** in seconds
+    and evicts the least recently used entry once ***maxsize*** entries are stored.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttls: Optional[Dict[Endpoints, float]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+
+    def cacheable(self, endpoint: Endpoints) -> bool:
+        return endpoint.value.method == "GET" and bool(self.ttls.get(endpoint))
+
+    @staticmethod
+    def key(endpoint: Endpoints, url: str, params: Optional[dict] = None) -> str:
+        params = sorted((params or {}).items())
+        return "{} {}?{}".format(endpoint.name, url, params)
+
+    def lookup(self, endpoint: Endpoints, key: str) -> Optional[bytes]:
+        content = self.get(key)
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    def store(self, endpoint: Endpoints, key: str, content: bytes):
+        self.set(key, content, self.ttls[endpoint])
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """ the cached body of ***key***, None when missing or expired """
+
+    @abstractmethod
+    def set(self, key: str, content: bytes, ttl: float):
+        """ store ***content*** under ***key*** for ***ttl*** seconds """
+
+    @abstractmethod
+    def invalidate(self, endpoint: Optional[Endpoints] = None):
+        """ drop every entry of ***endpoint***, or everything when None """
+
+
+class MemoryCache(ResponseCache):
+    """ MemoryCache: in-process LRU response cache"""
+
+    def __init__(
+        self, maxsize: int = 1024, ttls: Optional[Dict[Endpoints, float]] = None
+    ):
+        super().__init__(maxsize, ttls)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, content = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return content
+
+    def set(self, key: str, content: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: Optional[Endpoints] = None):
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                return
+            prefix = endpoint.name + " "
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class DiskCache(ResponseCache):
+    """
+    DiskCache: SQLite backed LRU response cache that survives restarts
+    and can be shared by processes on the same host.
+    Where ***path*** is the SQLite file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int = 4096,
+        ttls: Optional[Dict[Endpoints, float]] = None,
+    ):
+        super().__init__(maxsize, ttls)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires REAL, used REAL, content BLOB)"
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT expires, content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+            return row[1]
+
+    def set(self, key: str, content: bytes, ttl: float):
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, now + ttl, now, content),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def invalidate(self, endpoint: Optional[Endpoints] = None):
+        with self._lock, self._db:
+            if endpoint is None:
+                self._db.execute("DELETE FROM responses")
+            else:
+                self._db.execute(
+                    "DELETE FROM responses WHERE substr(key, 1, ?) = ?",
+                    (len(endpoint.name) + 1, endpoint.name + " "),
+                )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,191 @@
+"""
+Project Name: Wsimple
+File Name: api/concurrency.py
+**File: helpers to run independent requests concurrently**
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed, wait
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# monotonic deadline of the fan_out sub-request running on this thread, the requestor
+# caps its http timeout and retries to it so timed-out work frees its worker
+_deadline: ContextVar[Optional[float]] = ContextVar("wsimple_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """ seconds left to the deadline of the current sub-request, None without one """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def cap_timeout(timeout):
+    """
+    Cap a requests ***timeout*** (seconds, (connect, read) or None) to the seconds
+    left to the deadline of the current sub-request.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(left if part is None else min(part, left) for part in timeout)
+    return left if timeout is None else min(timeout, left)
+
+
+def _with_deadline(call: Callable, deadline: float) -> Callable:
+    def run():
+        token = _deadline.set(deadline)
+        try:
+            return call()
+        finally:
+            _deadline.reset(token)
+
+    return run
+
+
+def fan_out(
+    executor,
+    calls: Dict[str, Callable],
+    timeout: Optional[float] = None,
+    partial: bool = False,
+):
+    """
+    Submit every call in ***calls*** to ***executor*** at once and collect the results by key.
+    Where ***timeout*** is the seconds each sub-request is given to finish: autoset None (no limit).
+    The requests of a sub-request get the time left as their http timeout and stop
+    retrying once it is spent, so a straggler does not hold its worker past the deadline.
+    Where ***partial*** returns what succeeded plus an "errors" dict instead of raising: autoset False.
+    """
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        calls = {key: _with_deadline(call, deadline) for key, call in calls.items()}
+    futures = {key: executor.submit(call) for key, call in calls.items()}
+    done, _ = wait(futures.values(), timeout=timeout)
+    results, errors = {}, {}
+    for key, future in futures.items():
+        if future not in done:
+            future.cancel()
+            errors[key] = TimeoutError(f"{key} did not finish in {timeout}s")
+        elif future.exception() is not None:
+            errors[key] = future.exception()
+        else:
+            results[key] = future.result()
+    if not partial:
+        for error in errors.values():
+            raise error
+        return results
+    for key in errors:
+        results[key] = None
+    results["errors"] = errors
+    return results
+
+
+class BatchResult(NamedTuple):
+    """ BatchResult: holds the outcome of one item of a batch, in input order"""
+
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Pacer:
+    """
+    Pacer: spaces out calls so that at most ***rate*** start per second
+    across every thread sharing it.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def run_batch(
+    items: Iterable,
+    call: Callable,
+    max_workers: int = 5,
+    rate_limit: Optional[float] = None,
+) -> List[BatchResult]:
+    """
+    Run ***call*** on every item concurrently and return a BatchResult per item in input order.
+    Where ***max_workers*** is the amount of items in flight at once: autoset 5.
+    Where ***rate_limit*** is the maximum amount of calls started per second: autoset None (no limit).
+    """
+    items = list(items)
+    pacer = Pacer(rate_limit) if rate_limit else None
+
+    def run_item(item):
+        if pacer is not None:
+            pacer.wait()
+        try:
+            return BatchResult(item, result=call(item))
+        except Exception as error:
+            return BatchResult(item, error=error)
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)), thread_name_prefix="wsimple-batch"
+    ) as executor:
+        return list(executor.map(run_item, items))
+
+
+def iter_batch(
+    items: Iterable,
+    call: Callable,
+    max_workers: int = 5,
+    rate_limit: Optional[float] = None,
+    retries: int = 0,
+    retry_on: Tuple[type, ...] = (),
+    backoff: float = 0.5,
+):
+    """
+    Like run_batch but yields every BatchResult as soon as it completes.
+    Where ***retries*** is how often an item failing with one of ***retry_on*** is retried: autoset 0.
+    Where ***backoff*** is the base delay in seconds of the jittered exponential retry delay: autoset 0.5.
+    """
+    pacer = Pacer(rate_limit) if rate_limit else None
+
+    def run_item(item):
+        attempt = 0
+        while True:
+            if pacer is not None:
+                pacer.wait()
+            try:
+                return BatchResult(item, result=call(item))
+            except retry_on:
+                if attempt >= retries:
+                    raise
+                time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+                attempt += 1
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="wsimple-batch"
+    )
+    futures = {executor.submit(run_item, item): item for item in items}
+    try:
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is None:
+                yield future.result()
+            else:
+                yield BatchResult(futures[future], error=error)
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -101,4 +101,13 @@ class WealthsimpleDownException(Exception):
     """Error thrown when an input to a method is unacceptable"""
 
     def __init__(self, message):
-        super(WealthsimpleDownException, self).__init__(str(message).strip())
\ No newline at end of file
+        super(WealthsimpleDownException, self).__init__(str(message).strip())
+
+class CircuitOpenError(Exception):
+    """Error thrown when requests are refused because Wealthsimple kept failing"""
+
+    def __init__(self, retry_after: float = 0):
+        self.retry_after = retry_after
+        super(CircuitOpenError, self).__init__(
+            f"Wealthsimple keeps failing, requests are paused for {retry_after:.0f}s"
+        )
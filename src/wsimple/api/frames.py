@@ -0,0 +1,184 @@
+"""
+Project Name: Wsimple
+File Name: api/frames.py
+**File: Columnar historical quote frames**
+"""
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .errors import MethodInputError
+
+FRAME_TYPES = ("array", "numpy", "pandas")
+PRICE_FIELDS = ("adjusted_price", "close", "price")
+
+
+def _timestamp(point: dict) -> float:
+    value = point["date"]
+    if point.get("time"):
+        value = "{}T{}".format(value, point["time"])
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _price(point: dict) -> float:
+    for field in PRICE_FIELDS:
+        value = point.get(field)
+        if value is not None:
+            return float(value["amount"] if isinstance(value, dict) else value)
+    return float("nan")
+
+
+class HistoricalFrame:
+    """
+    HistoricalFrame: a historical quote series held as contiguous arrays instead
+    of one Box per point. ***timestamps*** are UTC epoch seconds and ***prices***
+    are floats, both array.array("d"), ***currency*** is the series currency.
+    """
+
+    __slots__ = ("security_id", "timestamps", "prices", "currency")
+
+    def __init__(
+        self,
+        timestamps: array,
+        prices: array,
+        currency: Optional[str] = None,
+        security_id: Optional[str] = None,
+    ):
+        self.timestamps = timestamps
+        self.prices = prices
+        self.currency = currency
+        self.security_id = security_id
+
+    @classmethod
+    def from_results(
+        cls, results: Iterable[dict], security_id: Optional[str] = None
+    ) -> "HistoricalFrame":
+        """ build a frame from the "results" of a historical quotes response """
+        results = list(results)
+        currency = results[0].get("currency") if results else None
+        if security_id is None and results:
+            security_id = results[0].get("security_id")
+        return cls(
+            array("d", map(_timestamp, results)),
+            array("d", map(_price, results)),
+            currency,
+            security_id,
+        )
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __repr__(self) -> str:
+        return "HistoricalFrame(security_id={}, points={}, currency={})".format(
+            self.security_id, len(self), self.currency
+        )
+
+    def returns(self) -> List[float]:
+        """ simple returns between consecutive points """
+        prices = self.prices
+        return [prices[i] / prices[i - 1] - 1 for i in range(1, len(prices))]
+
+    def to_numpy(self) -> dict:
+        """ numpy arrays sharing the frame memory: {"timestamps", "prices"} """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("HistoricalFrame.to_numpy requires numpy: pip install numpy")
+        return {
+            "timestamps": np.frombuffer(self.timestamps, dtype=np.float64),
+            "prices": np.frombuffer(self.prices, dtype=np.float64),
+        }
+
+    def to_pandas(self):
+        """ pandas DataFrame with a UTC DatetimeIndex and price/currency columns """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError(
+                "HistoricalFrame.to_pandas requires pandas: pip install pandas"
+            )
+        columns = self.to_numpy()
+        index = pd.to_datetime(columns["timestamps"], unit="s", utc=True)
+        return pd.DataFrame(
+            {"price": columns["prices"], "currency": self.currency}, index=index
+        )
+
+
+def to_frame(response, frame: str, security_id: Optional[str] = None):
+    """
+    Convert a historical quotes response into ***frame***, one of [array, numpy, pandas].
+    """
+    if frame not in FRAME_TYPES:
+        raise MethodInputError(f"frame must be one of {FRAME_TYPES}, not {frame}")
+    historical = HistoricalFrame.from_results(response["results"], security_id)
+    if frame == "numpy":
+        return historical.to_numpy()
+    elif frame == "pandas":
+        return historical.to_pandas()
+    return historical
+
+
+def check_frames_path(path: str):
+    """
+    Raise before any work is done when write_frames cannot write ***path***:
+    an unsupported suffix or a missing numpy/pyarrow.
+    """
+    if path.endswith(".npz"):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            raise ImportError("writing .npz files requires numpy: pip install numpy")
+    elif path.endswith((".parquet", ".arrow", ".feather")):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "writing parquet/arrow files requires pyarrow: pip install pyarrow"
+            )
+    else:
+        raise MethodInputError(
+            f"unsupported file type {path}, use .npz, .parquet, .arrow or .feather"
+        )
+
+
+def write_frames(frames: Dict[str, HistoricalFrame], path: str):
+    """
+    Write many frames to one columnar file chosen by the ***path*** suffix:
+    ".npz" (numpy, one timestamps/prices pair per security) or ".parquet",
+    ".arrow", ".feather" (pyarrow, long table of security_id, timestamp, price, currency).
+    """
+    check_frames_path(path)
+    if path.endswith(".npz"):
+        import numpy as np
+
+        columns = {}
+        for security_id, historical in frames.items():
+            arrays = historical.to_numpy()
+            columns[f"{security_id}.timestamps"] = arrays["timestamps"]
+            columns[f"{security_id}.prices"] = arrays["prices"]
+        np.savez(path, **columns)
+    else:
+        import pyarrow as pa
+
+        security_ids, timestamps, prices, currencies = [], array("d"), array("d"), []
+        for security_id, historical in frames.items():
+            security_ids.extend([security_id] * len(historical))
+            currencies.extend([historical.currency] * len(historical))
+            timestamps.extend(historical.timestamps)
+            prices.extend(historical.prices)
+        table = pa.table(
+            {
+                "security_id": pa.array(security_ids, pa.string()),
+                "timestamp": pa.array(timestamps, pa.float64()),
+                "price": pa.array(prices, pa.float64()),
+                "currency": pa.array(currencies, pa.string()),
+            }
+        )
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, path)
+        else:
+            import pyarrow.feather as feather
+
+            feather.write_feather(table, path)
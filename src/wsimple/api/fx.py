@@ -0,0 +1,199 @@
+"""
+Project Name: Wsimple
+File Name: api/fx.py
+**File: Cached forex rate snapshot and batch currency conversion**
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .errors import MethodInputError
+
+BASE_CURRENCY = "CAD"
+
+
+class RateSnapshot:
+    """
+    RateSnapshot: the forex rates of one GET_EXCHANGE_RATE response, frozen at ***fetched_at***.
+    ***rates*** maps a currency to its (buy_rate, sell_rate) against CAD, the same
+    rates exchange_to always used: CAD -> USD divides by buy_rate, USD -> CAD multiplies by sell_rate.
+    """
+
+    __slots__ = ("rates", "fetched_at", "_factors")
+
+    def __init__(self, rates: Dict[str, Tuple[float, float]], fetched_at: datetime):
+        self.rates = rates
+        self.fetched_at = fetched_at
+        self._factors: Dict[Tuple[str, str], float] = {}
+
+    @classmethod
+    def from_response(cls, response) -> "RateSnapshot":
+        rates = {
+            currency: (float(rate["buy_rate"]), float(rate["sell_rate"]))
+            for currency, rate in response.items()
+            if isinstance(rate, dict) and "buy_rate" in rate
+        }
+        return cls(rates, datetime.now())
+
+    @property
+    def age(self) -> timedelta:
+        return datetime.now() - self.fetched_at
+
+    def _rate(self, currency: str) -> Tuple[float, float]:
+        try:
+            return self.rates[currency]
+        except KeyError:
+            raise MethodInputError(f"no exchange rate for currency {currency}")
+
+    def factor(self, source: str, to: str) -> float:
+        """ the multiplier converting an amount in ***source*** into ***to*** """
+        key = (source, to)
+        factor = self._factors.get(key)
+        if factor is None:
+            factor = 1.0
+            if source != to:
+                if source != BASE_CURRENCY:
+                    factor *= self._rate(source)[1]
+                if to != BASE_CURRENCY:
+                    factor /= self._rate(to)[0]
+            self._factors[key] = factor
+        return factor
+
+    def convert(
+        self, amounts, currencies: Union[str, Sequence[str]], to: str = BASE_CURRENCY
+    ):
+        """
+        Convert every amount into ***to*** in one pass.
+        Where ***amounts*** is a list/array of numbers or a numpy array.
+        Where ***currencies*** is the currency of every amount, or one currency for all of them.
+        Returns a numpy array for numpy input, otherwise a list of floats.
+        """
+        if isinstance(currencies, str):
+            factor = self.factor(currencies, to)
+            if hasattr(amounts, "__array__"):
+                return amounts * factor
+            return [float(amount) * factor for amount in amounts]
+        if len(amounts) != len(currencies):
+            raise MethodInputError(
+                f"{len(amounts)} amounts but {len(currencies)} currencies"
+            )
+        if hasattr(amounts, "__array__"):
+            import numpy as np
+
+            # one factor per distinct currency, broadcast back over every amount
+            codes, inverse = np.unique(np.asarray(currencies), return_inverse=True)
+            factors = np.array([self.factor(str(code), to) for code in codes])
+            return np.asarray(amounts, dtype=float) * factors[inverse]
+        factors = {currency: self.factor(currency, to) for currency in set(currencies)}
+        return [
+            float(amount) * factors[currency]
+            for amount, currency in zip(amounts, currencies)
+        ]
+
+
+def money_columns(
+    items: Iterable[dict], field: str = "market_value"
+) -> Tuple[List[float], List[str]]:
+    """
+    Split the {amount, currency} ***field*** of every item (e.g. get_positions results)
+    into an amounts column and a currencies column.
+    """
+    amounts, currencies = [], []
+    for item in items:
+        money = item[field] if field else item
+        amounts.append(float(money["amount"]))
+        currencies.append(money["currency"])
+    return amounts, currencies
+
+
+class FxRates:
+    """
+    FxRates: keeps one RateSnapshot and converts batches of amounts against it, so
+    valuing a multi-currency book costs at most one GET_EXCHANGE_RATE.
+    The snapshot is reloaded on use once it is older than ***max_age***. When that
+    reload fails the old snapshot keeps being used until it is older than ***max_stale***,
+    after which the error is raised.
+    Where ***max_age*** is how long a snapshot is used without reloading: autoset 1 minute.
+    Where ***max_stale*** is the oldest snapshot used when reloading fails, None never: autoset 15 minutes.
+    Where ***invalidate*** drops any cached GET_EXCHANGE_RATE response before a reload, so
+    the snapshot age is the age of the rates: autoset None.
+    """
+
+    def __init__(
+        self,
+        loader: Callable,
+        max_age: timedelta = timedelta(minutes=1),
+        max_stale: Optional[timedelta] = timedelta(minutes=15),
+        invalidate: Optional[Callable[[], None]] = None,
+    ):
+        self._loader = loader
+        self._invalidate = invalidate
+        self.max_age = max_age
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._snapshot: Optional[RateSnapshot] = None
+
+    @property
+    def stale(self) -> bool:
+        return self._snapshot is None or self._snapshot.age >= self.max_age
+
+    def _fetch(self, tokens=None) -> RateSnapshot:
+        if self._invalidate is not None:
+            self._invalidate()
+        return RateSnapshot.from_response(self._loader(tokens=tokens))
+
+    def refresh(self, tokens=None) -> RateSnapshot:
+        """ reload the rates from Wealthsimple """
+        with self._lock:
+            self._snapshot = self._fetch(tokens=tokens)
+            return self._snapshot
+
+    def invalidate(self):
+        """ drop the snapshot, the next conversion reloads it """
+        with self._lock:
+            self._snapshot = None
+
+    def snapshot(self, tokens=None, max_age: Optional[timedelta] = None) -> RateSnapshot:
+        """
+        The current snapshot, reloaded when older than ***max_age***: autoset the FxRates max_age.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age < max_age:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.age < max_age:
+                return snapshot
+            try:
+                self._snapshot = self._fetch(tokens=tokens)
+            except Exception:
+                if snapshot is None or (
+                    self.max_stale is not None and snapshot.age >= self.max_stale
+                ):
+                    raise
+            return self._snapshot
+
+    def convert(
+        self,
+        amounts,
+        currencies: Union[str, Sequence[str]],
+        to: str = BASE_CURRENCY,
+        tokens=None,
+    ):
+        """ convert a batch of amounts into ***to***, see RateSnapshot.convert """
+        return self.snapshot(tokens=tokens).convert(amounts, currencies, to)
+
+    def total(
+        self,
+        items: Iterable[dict],
+        to: str = BASE_CURRENCY,
+        field: str = "market_value",
+        tokens=None,
+    ) -> float:
+        """
+        Sum the {amount, currency} ***field*** of every item in ***to***,
+        e.g. the market value of every get_positions result.
+        """
+        amounts, currencies = money_columns(items, field)
+        return sum(self.convert(amounts, currencies, to, tokens=tokens))
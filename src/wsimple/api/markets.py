@@ -0,0 +1,218 @@
+"""
+Project Name: Wsimple
+File Name: api/markets.py
+**File: Market calendar indexed by exchange name and MIC**
+"""
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .errors import MethodInputError
+
+OPEN_FIELDS = ("opens_at", "open_at", "opening_time")
+CLOSE_FIELDS = ("closes_at", "close_at", "closing_time")
+
+
+def _epoch(session: dict, fields: Tuple[str, ...]) -> Optional[float]:
+    for field in fields:
+        value = session.get(field)
+        if value:
+            break
+    else:
+        return None
+    value = str(value).replace("Z", "+00:00")
+    if "T" not in value and session.get("date"):
+        value = "{}T{}".format(session["date"], value)
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _utc(epoch: Optional[float]) -> Optional[datetime]:
+    return None if epoch is None else datetime.fromtimestamp(epoch, timezone.utc)
+
+
+class MarketSessions:
+    """
+    MarketSessions: one market of GET_ALL_MARKETS with its trading sessions as
+    sorted epoch ***opens*** and ***closes***, merged over every entry of that market.
+    """
+
+    __slots__ = ("market", "opens", "closes")
+
+    def __init__(self, market):
+        self.market = market
+        self.opens: List[float] = []
+        self.closes: List[float] = []
+        self.add(market)
+
+    def add(self, market):
+        """ merge the sessions of another entry of the same market """
+        sessions = set(zip(self.opens, self.closes))
+        for session in market.get("sessions") or [market]:
+            opens, closes = _epoch(session, OPEN_FIELDS), _epoch(session, CLOSE_FIELDS)
+            if opens is not None and closes is not None:
+                sessions.add((opens, closes))
+        sessions = sorted(sessions)
+        self.opens = [opens for opens, _ in sessions]
+        self.closes = [closes for _, closes in sessions]
+
+    def ahead(self, now: float) -> bool:
+        """ whether a session is open at ***now*** or published after it """
+        return bool(self.closes) and now < self.closes[-1]
+
+    def _session(self, now: float) -> int:
+        """ index of the latest session opened at ***now***, -1 before the first """
+        return bisect_right(self.opens, now) - 1
+
+    def is_open(self, now: float) -> bool:
+        i = self._session(now)
+        return i >= 0 and now < self.closes[i]
+
+    def next_open(self, now: float) -> Optional[float]:
+        i = self._session(now) + 1
+        return self.opens[i] if i < len(self.opens) else None
+
+    def next_close(self, now: float) -> Optional[float]:
+        i = bisect_right(self.closes, now)
+        return self.closes[i] if i < len(self.closes) else None
+
+
+class MarketCalendar:
+    """
+    MarketCalendar: the market hours of GET_ALL_MARKETS indexed by exchange name and MIC,
+    so that order routing can ask whether a market is open without a request.
+    GET_ALL_MARKETS only publishes the current sessions, so the markets are loaded on
+    first use and reloaded when the date changes, once they are older than ***ttl***,
+    and at most every ***recheck*** while an exchange has no session open or ahead.
+    Where ***exh_to_mic*** maps exchange names to MIC codes: autoset Wsimple.exh_to_mic.
+    Where ***ttl*** is the longest the markets are used before reloading: autoset 1 day.
+    Where ***recheck*** is how often an exchange past its last known close reloads: autoset 15 minutes.
+    Where ***invalidate*** drops any cached GET_ALL_MARKETS response before a reload, so
+    a reload sees the sessions Wealthsimple publishes now: autoset None.
+    """
+
+    def __init__(
+        self,
+        loader: Callable,
+        exh_to_mic: Optional[Dict[str, str]] = None,
+        ttl: timedelta = timedelta(days=1),
+        recheck: timedelta = timedelta(minutes=15),
+        invalidate: Optional[Callable[[], None]] = None,
+    ):
+        self._loader = loader
+        self._invalidate = invalidate
+        self.exh_to_mic = exh_to_mic or {}
+        self.ttl = ttl
+        self.recheck = recheck
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, MarketSessions]] = None
+        self._loaded_at: Optional[datetime] = None
+
+    @property
+    def stale(self) -> bool:
+        if self._index is None:
+            return True
+        now = datetime.now()
+        return now.date() != self._loaded_at.date() or now - self._loaded_at >= self.ttl
+
+    def _load(self, tokens=None) -> Dict[str, MarketSessions]:
+        if self._invalidate is not None:
+            self._invalidate()
+        index = {}
+        for market in self._loader(tokens=tokens)["results"]:
+            name = market.get("exchange_name")
+            keys = [
+                key.upper()
+                for key in (name, market.get("exchange_mic"), self.exh_to_mic.get(name))
+                if key
+            ]
+            # an exchange listed more than once keeps the sessions of every entry
+            sessions = next((index[key] for key in keys if key in index), None)
+            if sessions is None:
+                sessions = MarketSessions(market)
+            else:
+                sessions.add(market)
+            for key in keys:
+                index[key] = sessions
+        self._index = index
+        self._loaded_at = datetime.now()
+        return index
+
+    def refresh(self, tokens=None):
+        """ reload the markets from Wealthsimple """
+        with self._lock:
+            self._load(tokens=tokens)
+
+    def invalidate(self):
+        """ drop the markets, the next lookup reloads them """
+        with self._lock:
+            self._index = None
+            self._loaded_at = None
+
+    def _behind(self, sessions: Optional[MarketSessions]) -> bool:
+        """ whether ***sessions*** has nothing open or ahead and the recheck interval passed """
+        return (
+            sessions is not None
+            and not sessions.ahead(time.time())
+            and datetime.now() - self._loaded_at >= self.recheck
+        )
+
+    def _sessions(self, exchange: str, tokens=None) -> Optional[MarketSessions]:
+        key = exchange.upper()
+        index = self._index
+        if self.stale or self._behind(index.get(key)):
+            with self._lock:
+                index = self._index
+                if self.stale or self._behind(index.get(key)):
+                    index = self._load(tokens=tokens)
+        return index.get(key)
+
+    def _get(self, exchange: str, tokens=None) -> MarketSessions:
+        sessions = self._sessions(exchange, tokens=tokens)
+        if sessions is None:
+            raise MethodInputError(f"unknown exchange {exchange}")
+        return sessions
+
+    @staticmethod
+    def _now(at: Optional[datetime]) -> float:
+        return datetime.now(timezone.utc).timestamp() if at is None else at.timestamp()
+
+    def market(self, exchange: str, tokens=None):
+        """
+        The GET_ALL_MARKETS entry of an exchange, None if unknown.
+        Where ***exchange*** is an exchange name (TSX, NYSE, ...) or MIC (XTSE, XNYS, ...).
+        """
+        sessions = self._sessions(exchange, tokens=tokens)
+        return None if sessions is None else sessions.market
+
+    def is_open(self, exchange: str, at: Optional[datetime] = None, tokens=None) -> bool:
+        """
+        Whether ***exchange*** trades at ***at*** (an aware datetime): autoset now.
+        """
+        return self._get(exchange, tokens=tokens).is_open(self._now(at))
+
+    def next_open(
+        self, exchange: str, at: Optional[datetime] = None, tokens=None
+    ) -> Optional[datetime]:
+        """ UTC start of the next session of ***exchange***, None when not published yet """
+        return _utc(self._get(exchange, tokens=tokens).next_open(self._now(at)))
+
+    def next_close(
+        self, exchange: str, at: Optional[datetime] = None, tokens=None
+    ) -> Optional[datetime]:
+        """ UTC end of the current or next session of ***exchange***, None when not published yet """
+        return _utc(self._get(exchange, tokens=tokens).next_close(self._now(at)))
+
+    def seconds_until_close(
+        self, exchange: str, at: Optional[datetime] = None, tokens=None
+    ) -> Optional[float]:
+        """ seconds left in the current session of ***exchange***, None while it is closed """
+        now = self._now(at)
+        sessions = self._get(exchange, tokens=tokens)
+        if not sessions.is_open(now):
+            return None
+        return sessions.next_close(now) - now
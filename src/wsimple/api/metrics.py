@@ -0,0 +1,160 @@
+"""
+Project Name: Wsimple
+File Name: api/metrics.py
+**File: Request metrics with snapshot, Prometheus and callback sinks**
+"""
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# name of the label of the labelled counters in the Prometheus output
+LABEL_NAMES = {"responses": "status", "cache": "result", "token_refreshes": "result"}
+
+
+class Histogram:
+    """ Histogram: per bucket (not cumulative) counts plus the sum and count of observations """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": dict(zip(self.buckets + (float("inf"),), self.counts)),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class Metrics:
+    """
+    Metrics: records what requestor and the token manager do, per endpoint:
+    request latency histograms, status code counters, retries, bytes received,
+    json decode and response conversion time, cache hits and token refreshes.
+    Read it with ***snapshot()*** (dict) or ***prometheus()*** (text exposition format),
+    or pass ***callbacks*** receiving every event as (event, endpoint, value, labels).
+    """
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        callbacks: Optional[List[Callable[[str, str, float, dict], None]]] = None,
+    ):
+        self.buckets = buckets
+        self.callbacks = list(callbacks or [])
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str, str], float] = {}
+
+    def add_callback(self, callback: Callable[[str, str, float, dict], None]):
+        self.callbacks.append(callback)
+
+    def _emit(self, event: str, endpoint: str, value: float, labels: dict):
+        for callback in self.callbacks:
+            callback(event, endpoint, value, labels)
+
+    def _observe(self, metric: str, endpoint: str, seconds: float):
+        key = (metric, endpoint)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def _count(self, metric: str, endpoint: str, label: str = "", value: float = 1):
+        key = (metric, endpoint, label)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    #! record functions
+    def request(self, endpoint: str, status, seconds: float, size: int = 0):
+        """ one http attempt, ***status*** is the status code or the error name """
+        with self._lock:
+            self._observe("request_seconds", endpoint, seconds)
+            self._count("responses", endpoint, str(status))
+            self._count("bytes_received", endpoint, value=size)
+        self._emit("request", endpoint, seconds, {"status": status, "bytes": size})
+
+    def retry(self, endpoint: str):
+        with self._lock:
+            self._count("retries", endpoint)
+        self._emit("retry", endpoint, 1, {})
+
+    def decode(self, endpoint: str, seconds: float, convert_seconds: float):
+        """ json decoding and response_format conversion time of one response """
+        with self._lock:
+            self._observe("decode_seconds", endpoint, seconds)
+            self._observe("convert_seconds", endpoint, convert_seconds)
+        self._emit("decode", endpoint, seconds, {"convert": convert_seconds})
+
+    def cache(self, endpoint: str, hit: bool):
+        with self._lock:
+            self._count("cache", endpoint, "hit" if hit else "miss")
+        self._emit("cache", endpoint, 1, {"hit": hit})
+
+    def token_refresh(self, seconds: float, ok: bool = True):
+        with self._lock:
+            self._observe("token_refresh_seconds", "REFRESH", seconds)
+            self._count("token_refreshes", "REFRESH", "ok" if ok else "error")
+        self._emit("token_refresh", "REFRESH", seconds, {"ok": ok})
+
+    #! sink functions
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        """ {metric: {endpoint: histogram dict or {label: count}}} """
+        snapshot: Dict[str, Dict[str, dict]] = {}
+        with self._lock:
+            for (metric, endpoint), histogram in self._histograms.items():
+                snapshot.setdefault(metric, {})[endpoint] = histogram.to_dict()
+            for (metric, endpoint, label), value in self._counters.items():
+                counters = snapshot.setdefault(metric, {})
+                if label:
+                    counters.setdefault(endpoint, {})[label] = value
+                else:
+                    counters[endpoint] = value
+        return snapshot
+
+    def prometheus(self, prefix: str = "wsimple") -> str:
+        """ every metric in the Prometheus text exposition format """
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        typed = set()
+        for (metric, endpoint), histogram in histograms:
+            name = f"{prefix}_{metric}"
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'{name}_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}'
+                )
+            lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+            lines.append(f'{name}_count{{endpoint="{endpoint}"}} {histogram.count}')
+        for (metric, endpoint, label), value in counters:
+            name = f"{prefix}_{metric}_total"
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            labels = f'endpoint="{endpoint}"'
+            if label:
+                labels += f',{LABEL_NAMES.get(metric, "label")}="{label}"'
+            lines.append(f"{name}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,235 @@
+"""
+Project Name: Wsimple
+File Name: api/models.py
+**File: Light weight response models used instead of Box on the fast path**
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+
+class Model(ABC):
+    """
+    Model: base of the slotted response models. The typed fields hold the values
+    most callers need and ***raw*** keeps the untouched payload, which can still
+    be read with model["key"] or model.get("key").
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        return self.raw[key]
+
+    def get(self, key: str, default=None):
+        return self.raw.get(key, default)
+
+    def to_dict(self) -> dict:
+        return self.raw
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, data: dict):
+        """ build the model from a decoded response payload """
+
+
+def _amount(value) -> Optional[float]:
+    """ unwrap {"amount": x, "currency": y} money objects """
+    if isinstance(value, dict):
+        return value.get("amount")
+    return value
+
+
+def _stock(data: dict) -> dict:
+    return data.get("stock") or {}
+
+
+@dataclass
+class Account(Model):
+    __slots__ = ("id", "account_type", "currency", "buying_power", "deleted_at", "raw")
+
+    id: str
+    account_type: str
+    currency: Optional[str]
+    buying_power: Optional[float]
+    deleted_at: Optional[str]
+    raw: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Account":
+        return cls(
+            data.get("id"),
+            data.get("account_type"),
+            data.get("base_currency"),
+            _amount(data.get("buying_power")),
+            data.get("deleted_at"),
+            data,
+        )
+
+
+@dataclass
+class Order(Model):
+    __slots__ = (
+        "order_id",
+        "account_id",
+        "security_id",
+        "symbol",
+        "status",
+        "order_type",
+        "order_sub_type",
+        "quantity",
+        "fill_quantity",
+        "limit_price",
+        "created_at",
+        "raw",
+    )
+
+    order_id: str
+    account_id: Optional[str]
+    security_id: Optional[str]
+    symbol: Optional[str]
+    status: Optional[str]
+    order_type: Optional[str]
+    order_sub_type: Optional[str]
+    quantity: Optional[float]
+    fill_quantity: Optional[float]
+    limit_price: Optional[float]
+    created_at: Optional[str]
+    raw: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Order":
+        return cls(
+            data.get("order_id"),
+            data.get("account_id"),
+            data.get("security_id"),
+            data.get("symbol"),
+            data.get("status"),
+            data.get("order_type"),
+            data.get("order_sub_type"),
+            data.get("quantity"),
+            data.get("fill_quantity"),
+            _amount(data.get("limit_price")),
+            data.get("created_at"),
+            data,
+        )
+
+
+@dataclass
+class Activity(Model):
+    __slots__ = (
+        "id",
+        "type",
+        "account_id",
+        "security_id",
+        "symbol",
+        "quantity",
+        "amount",
+        "currency",
+        "occurred_at",
+        "raw",
+    )
+
+    id: str
+    type: Optional[str]
+    account_id: Optional[str]
+    security_id: Optional[str]
+    symbol: Optional[str]
+    quantity: Optional[float]
+    amount: Optional[float]
+    currency: Optional[str]
+    occurred_at: Optional[str]
+    raw: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Activity":
+        value = data.get("market_value") or data.get("value") or {}
+        return cls(
+            data.get("id"),
+            data.get("type"),
+            data.get("account_id"),
+            data.get("security_id"),
+            data.get("symbol"),
+            data.get("quantity"),
+            _amount(value),
+            value.get("currency") if isinstance(value, dict) else None,
+            data.get("occurred_at"),
+            data,
+        )
+
+
+@dataclass
+class Position(Model):
+    __slots__ = (
+        "security_id",
+        "account_id",
+        "symbol",
+        "quantity",
+        "market_value",
+        "book_value",
+        "currency",
+        "raw",
+    )
+
+    security_id: str
+    account_id: Optional[str]
+    symbol: Optional[str]
+    quantity: Optional[float]
+    market_value: Optional[float]
+    book_value: Optional[float]
+    currency: Optional[str]
+    raw: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Position":
+        market_value = data.get("market_value") or {}
+        return cls(
+            data.get("id"),
+            data.get("account_id"),
+            _stock(data).get("symbol"),
+            data.get("quantity"),
+            _amount(market_value),
+            _amount(data.get("book_value")),
+            market_value.get("currency") if isinstance(market_value, dict) else None,
+            data,
+        )
+
+
+@dataclass
+class Quote(Model):
+    __slots__ = (
+        "security_id",
+        "symbol",
+        "exchange",
+        "amount",
+        "bid",
+        "ask",
+        "currency",
+        "quote_date",
+        "raw",
+    )
+
+    security_id: str
+    symbol: Optional[str]
+    exchange: Optional[str]
+    amount: Optional[float]
+    bid: Optional[float]
+    ask: Optional[float]
+    currency: Optional[str]
+    quote_date: Optional[str]
+    raw: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Quote":
+        stock = _stock(data)
+        quote = data.get("quote") or {}
+        return cls(
+            data.get("id"),
+            stock.get("symbol"),
+            stock.get("primary_exchange"),
+            _amount(quote.get("amount")),
+            _amount(quote.get("bid")),
+            _amount(quote.get("ask")),
+            data.get("currency"),
+            quote.get("quote_date"),
+            data,
+        )
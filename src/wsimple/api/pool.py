@@ -0,0 +1,166 @@
+"""
+Project Name: Wsimple
+File Name: api/pool.py
+**File: Many authenticated identities sharing one session, limiter and security master**
+"""
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from .api import Wsimple
+from .cache import MemoryCache
+from .concurrency import BatchResult, run_batch
+from .errors import MethodInputError
+from .resilience import CircuitBreaker, RetryPolicy
+from .securities import SecurityMaster
+from .session import SessionPool
+
+
+class WsimplePool:
+    """
+    WsimplePool: holds many logged in Wsimple instances (identities) by key.
+    Every identity shares one SessionPool (connections, cache, retry policy, circuit
+    breaker, optional rate limiter and metrics) and one SecurityMaster, while keeping its own tokens.
+    Logins and token refreshes of many identities run concurrently.
+    Where ***session*** is the shared SessionPool: autoset a new one of ***pool_size*** connections.
+    Where ***max_workers*** is the amount of logins, refreshes or calls in flight at once: autoset 10.
+    Where ***limiter*** (keyword) is a RateLimiter shared by every identity: autoset None.
+    Other keyword arguments are passed to every Wsimple (verbose_mode, response_format, ...).
+    """
+
+    def __init__(
+        self,
+        session: Optional[SessionPool] = None,
+        pool_size: int = 20,
+        max_workers: int = 10,
+        securities: Optional[SecurityMaster] = None,
+        **defaults,
+    ):
+        if session is None:
+            session = SessionPool(
+                pool_size,
+                cache=MemoryCache(),
+                retry=RetryPolicy(),
+                breaker=CircuitBreaker(),
+                limiter=defaults.pop("limiter", None),
+                metrics=defaults.pop("metrics", None),
+            )
+        self.session = session
+        self.securities = SecurityMaster() if securities is None else securities
+        self.max_workers = max_workers
+        self.defaults = {"verbose_mode": False, **defaults}
+        self._lock = threading.Lock()
+        self._clients: Dict[Hashable, Wsimple] = {}
+
+    def _options(self, options: dict) -> dict:
+        return {
+            **self.defaults,
+            **options,
+            "session": self.session,
+            "securities": self.securities,
+        }
+
+    #! identity functions
+    def add(self, key: Hashable, wsimple: Wsimple) -> Wsimple:
+        """ register an existing instance under ***key*** """
+        with self._lock:
+            self._clients[key] = wsimple
+        return wsimple
+
+    def login(self, key: Hashable, email: str, password: str, **options) -> Wsimple:
+        """
+        Log an identity in with the shared session and register it under ***key***.
+        Keyword arguments (otp_callback, ...) are passed to Wsimple.
+        """
+        return self.add(key, Wsimple(email, password, **self._options(options)))
+
+    def oauth_login(self, key: Hashable, token_dict, **options) -> Wsimple:
+        """ register an identity from a predefined list of tokens """
+        return self.add(
+            key,
+            Wsimple(
+                "", "", oauth_mode=True, tokens=token_dict, **self._options(options)
+            ),
+        )
+
+    def login_all(self, credentials: Dict[Hashable, dict]) -> Dict[Hashable, BatchResult]:
+        """
+        Log many identities in concurrently.
+        Where ***credentials*** maps keys to Wsimple keyword arguments (email, password, otp_callback, ...).
+        Returns a BatchResult (item=key, result=Wsimple, error) per key, failed logins are not registered.
+        """
+        results = run_batch(
+            list(credentials),
+            lambda key: self.login(key, **credentials[key]),
+            max_workers=self.max_workers,
+        )
+        return {result.item: result for result in results}
+
+    def remove(self, key: Hashable):
+        """ unregister ***key*** and stop its background token refresh """
+        with self._lock:
+            wsimple = self._clients.pop(key)
+        wsimple.close(close_session=False)
+
+    def get(self, key: Hashable) -> Wsimple:
+        """ the identity registered under ***key*** """
+        try:
+            return self._clients[key]
+        except KeyError:
+            raise MethodInputError(f"no identity registered under {key!r}")
+
+    __getitem__ = get
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __iter__(self):
+        return iter(list(self._clients))
+
+    def keys(self) -> List[Hashable]:
+        return list(self._clients)
+
+    #! routing functions
+    def call(self, key: Hashable, method: str, *args, **kwargs):
+        """ route ***method*** (a Wsimple method name) to the identity of ***key*** """
+        return getattr(self.get(key), method)(*args, **kwargs)
+
+    def map(
+        self, method: str, *args, keys: Optional[Iterable[Hashable]] = None, **kwargs
+    ) -> Dict[Hashable, BatchResult]:
+        """
+        Call ***method*** on many identities concurrently.
+        Where ***keys*** are the identities to call: autoset every identity.
+        Returns a BatchResult (item=key, result, error) per key.
+        """
+        keys = self.keys() if keys is None else list(keys)
+        results = run_batch(
+            keys,
+            lambda key: self.call(key, method, *args, **kwargs),
+            max_workers=self.max_workers,
+        )
+        return {result.item: result for result in results}
+
+    def refresh_all(self) -> Dict[Hashable, BatchResult]:
+        """ refresh the tokens of every identity that manages its tokens, concurrently """
+        keys = [key for key in self.keys() if self.get(key).token_manager is not None]
+        results = run_batch(
+            keys,
+            lambda key: self.get(key).token_manager.refresh(),
+            max_workers=self.max_workers,
+        )
+        return {result.item: result for result in results}
+
+    def close(self):
+        """ stop every identity and close the shared session """
+        for key in self.keys():
+            self.remove(key)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,246 @@
+"""
+Project Name: Wsimple
+File Name: api/portfolio.py
+**File: In-memory portfolio kept current by realtime events**
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from .concurrency import fan_out
+from .quotes import quote_security_id
+
+FILL_EVENTS = ("ORDER_FILLED",)
+BUY_ORDER_TYPES = ("buy_quantity", "buy_value")
+
+
+def _amount(value) -> Optional[float]:
+    if isinstance(value, dict):
+        value = value.get("amount")
+    return None if value is None else float(value)
+
+
+def _money(value) -> Optional[dict]:
+    return {"amount": value["amount"], "currency": value["currency"]} if value else None
+
+
+class PortfolioSnapshot:
+    """
+    PortfolioSnapshot: positions, cash and the USD/CAD rate of one account held in memory.
+    It is loaded through REST by ***reconcile***, then kept current by the ACCOUNT,
+    PRICE_QUOTE and ORDER_FILLED events of a RealtimeClient (see ***attach***) and
+    only reconciled again every ***reconcile_interval*** seconds, or sooner after a fill.
+    Where ***account_id*** is the account to follow: autoset your personal account.
+    Where ***reconcile_interval*** is the seconds between REST reconciliations: autoset 300.
+    """
+
+    def __init__(
+        self,
+        wsimple,
+        account_id: Optional[str] = None,
+        reconcile_interval: float = 300,
+        tokens=None,
+    ):
+        self.wsimple = wsimple
+        self.account_id = account_id
+        self.reconcile_interval = reconcile_interval
+        self.tokens = tokens
+        self.positions: Dict[str, dict] = {}
+        self.account: dict = {}
+        self.cash = 0.0
+        self.usd_to_cad = 1.0
+        self.previous_close: Optional[float] = None
+        self.reconciled_at: Optional[float] = None
+        self.updated_at: Optional[float] = None
+        self.events = 0
+        self._due = True
+        self._lock = threading.Lock()
+
+    #! rest reconciliation
+    @property
+    def stale(self) -> bool:
+        return (
+            self._due
+            or self.reconciled_at is None
+            or time.monotonic() - self.reconciled_at >= self.reconcile_interval
+        )
+
+    def reconcile(self):
+        """ reload positions, account and exchange rate through REST """
+        ws, tokens = self.wsimple, self.tokens
+        if self.account_id is None:
+            self.account_id = ws.account_registry.get("personal", tokens=tokens)
+        data = fan_out(
+            ws._fan_out_pool,
+            {
+                "positions": lambda: ws.get_positions(
+                    tokens=tokens, account_id=self.account_id, response_format="dict"
+                ),
+                "accounts": lambda: ws.get_accounts(tokens=tokens, response_format="dict"),
+                "history": lambda: ws.get_historical_portfolio_data(
+                    tokens=tokens, account_id=self.account_id
+                ),
+                "forex": lambda: ws.fx.snapshot(tokens=tokens),
+            },
+        )
+        account = next(
+            (a for a in data["accounts"]["results"] if a["id"] == self.account_id), {}
+        )
+        positions = {}
+        for position in data["positions"]["results"]:
+            quantity = float(position.get("quantity") or 0)
+            price = _amount((position.get("quote") or {}).get("amount"))
+            market_value = position.get("market_value") or {}
+            if price is None and quantity:
+                price = _amount(market_value) / quantity
+            positions[position["id"]] = {
+                "security_id": position["id"],
+                "symbol": (position.get("stock") or {}).get("symbol"),
+                "quantity": quantity,
+                "price": price or 0.0,
+                "currency": market_value.get("currency") or position.get("currency"),
+                "book_value": _amount(position.get("book_value")),
+            }
+        with self._lock:
+            self.positions = positions
+            self.account = account
+            self.usd_to_cad = data["forex"].factor("USD", "CAD")
+            previous = data["history"].get("previous_close_net_liquidation_value")
+            self.previous_close = _amount(previous)
+            net_liquidation = _amount(
+                account.get("net_liquidation") or account.get("current_balance")
+            )
+            # cash is whatever the account is worth beyond its positions
+            if net_liquidation is not None:
+                self.cash = net_liquidation - self._positions_value()
+            self.reconciled_at = self.updated_at = time.monotonic()
+            self._due = False
+
+    def reconcile_if_stale(self) -> bool:
+        """ reconcile when the interval passed or a fill asked for it, True if it did """
+        if not self.stale:
+            return False
+        self.reconcile()
+        return True
+
+    #! realtime events
+    def attach(self, client):
+        """ follow the ACCOUNT, PRICE_QUOTE and ORDER_FILLED events of a RealtimeClient """
+        for event_type in ("ACCOUNT", "PRICE_QUOTE") + FILL_EVENTS:
+            client.on(event_type, self.apply)
+        return self
+
+    def apply(self, event: dict):
+        """ update the snapshot from one realtime event """
+        event_type = event.get("type")
+        with self._lock:
+            self.events += 1
+            if event_type == "PRICE_QUOTE":
+                self._apply_quote(event)
+            elif event_type in FILL_EVENTS:
+                self._apply_fill(event)
+            elif event_type == "ACCOUNT":
+                self._apply_account(event)
+            self.updated_at = time.monotonic()
+
+    def _apply_quote(self, event: dict):
+        position = self.positions.get(quote_security_id(event))
+        if position is None:
+            return
+        quote = event.get("quote") or event.get("data") or event
+        price = _amount(quote.get("amount") or quote.get("price"))
+        if price is not None:
+            position["price"] = price
+
+    def _apply_fill(self, event: dict):
+        order = event.get("order") or event.get("data") or event
+        if order.get("account_id") not in (None, self.account_id):
+            return
+        security_id = order.get("security_id")
+        quantity = float(order.get("fill_quantity") or order.get("quantity") or 0)
+        price = _amount(order.get("fill_price"))
+        if security_id is None or not quantity:
+            self._due = True
+            return
+        if order.get("order_type") not in BUY_ORDER_TYPES:
+            quantity = -quantity
+        position = self.positions.setdefault(
+            security_id,
+            {
+                "security_id": security_id,
+                "symbol": order.get("symbol"),
+                "quantity": 0.0,
+                "price": price or 0.0,
+                "currency": (order.get("fill_price") or {}).get("currency"),
+                "book_value": None,
+            },
+        )
+        position["quantity"] += quantity
+        if price is not None:
+            position["price"] = price
+            self.cash -= quantity * price * self._rate(position["currency"])
+        if not position["quantity"]:
+            del self.positions[security_id]
+        # fills change book value and fees too, let the next check reconcile them
+        self._due = True
+
+    def _apply_account(self, event: dict):
+        account = event.get("account") or event.get("data") or event
+        if account.get("id") not in (None, self.account_id):
+            return
+        self.account.update(
+            {key: value for key, value in account.items() if key not in ("type", "id")}
+        )
+
+    #! values
+    def _rate(self, currency: Optional[str]) -> float:
+        return self.usd_to_cad if currency == "USD" else 1.0
+
+    def _positions_value(self) -> float:
+        return sum(
+            p["quantity"] * p["price"] * self._rate(p["currency"])
+            for p in self.positions.values()
+        )
+
+    @property
+    def value(self) -> float:
+        """ account value in CAD: cash plus every position at its last price """
+        with self._lock:
+            return self.cash + self._positions_value()
+
+    def summary(self) -> dict:
+        """
+        The dashboard numbers computed from memory: available to trade/withdraw,
+        net deposits, account value and change since the previous close.
+        """
+        with self._lock:
+            value = round(self.cash + self._positions_value(), 2)
+            account = self.account
+            result = {
+                "available_to_trade": _money(account.get("buying_power")),
+                "net_deposits": _money(account.get("net_deposits")),
+                "available_to_withdraw": _money(account.get("available_to_withdraw")),
+                "account_value": {"amount": value, "currency": "CAD"},
+                "account_positions": {"table": [dict(p) for p in self.positions.values()]},
+            }
+            if self.previous_close:
+                change = round(value - self.previous_close, 2)
+                result["account_change"] = {
+                    "amount": change,
+                    "percentage": round(change / self.previous_close * 100, 2),
+                }
+            return result
+
+    async def run(self):
+        """
+        Reconcile in the background whenever the snapshot is stale, until cancelled.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            if self.stale:
+                try:
+                    await loop.run_in_executor(None, self.reconcile)
+                except Exception as error:
+                    self.wsimple.logger.error(f"portfolio reconciliation failed: {error}")
+            await asyncio.sleep(min(self.reconcile_interval, 5))
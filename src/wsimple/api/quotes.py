@@ -0,0 +1,173 @@
+"""
+Project Name: Wsimple
+File Name: api/quotes.py
+**File: PRICE_QUOTE fan-out hub sharing one websocket between many consumers**
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from .errors import MethodInputError
+from .realtime import RealtimeClient
+
+OVERFLOW_POLICIES = ("drop_oldest", "conflate", "block")
+ALL_SECURITIES = "*"
+
+
+def quote_security_id(event: dict) -> Optional[str]:
+    """ default way of finding the security id of a PRICE_QUOTE event """
+    if "security_id" in event:
+        return event["security_id"]
+    for key in ("quote", "data"):
+        nested = event.get(key)
+        if isinstance(nested, dict) and "security_id" in nested:
+            return nested["security_id"]
+    return None
+
+
+class Subscription:
+    """
+    Subscription: one consumer of the QuoteHub with its own bounded queue.
+    Where ***overflow*** decides what happens when ***maxsize*** quotes are waiting:
+    "drop_oldest" drops the oldest quote, "conflate" keeps only the latest quote per
+    security (and drops the oldest security when full) and "block" makes the hub wait.
+    Read it with ***await get()*** or ***async for quote in subscription***.
+    """
+
+    def __init__(
+        self,
+        hub: "QuoteHub",
+        security_ids: Set[str],
+        maxsize: int = 100,
+        overflow: str = "drop_oldest",
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise MethodInputError(
+                f"overflow must be one of {OVERFLOW_POLICIES}, not {overflow}"
+            )
+        self.hub = hub
+        self.security_ids = security_ids
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.conflated = 0
+        self.closed = False
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._pending: "OrderedDict[str, dict]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    async def put(self, security_id: str, event: dict):
+        if self.overflow == "block":
+            await self._queue.put(event)
+        elif self.overflow == "drop_oldest":
+            if self._queue.full():
+                self._queue.get_nowait()
+                self.dropped += 1
+            self._queue.put_nowait(event)
+        else:
+            if security_id in self._pending:
+                self.conflated += 1
+            elif len(self._pending) >= self.maxsize:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[security_id] = event
+            self._ready.set()
+
+    async def get(self) -> dict:
+        """ wait for the next quote """
+        if self.overflow != "conflate":
+            return await self._queue.get()
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._pending.popitem(last=False)[1]
+
+    def qsize(self) -> int:
+        if self.overflow == "conflate":
+            return len(self._pending)
+        return self._queue.qsize()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self.closed:
+            raise StopAsyncIteration
+        return await self.get()
+
+    async def close(self):
+        """ stop receiving quotes """
+        self.closed = True
+        await self.hub.unsubscribe(self)
+
+
+class QuoteHub:
+    """
+    QuoteHub: multiplexes the PRICE_QUOTE events of one RealtimeClient connection
+    to many in-process subscribers, indexed by security id.
+    Where ***subscribe_message*** builds the upstream subscription message for a
+    security id, it is sent when the first subscriber of that security appears: autoset None.
+    Where ***unsubscribe_message*** builds the message sent when the last one leaves: autoset None.
+    Where ***key*** finds the security id of an event: autoset quote_security_id.
+    """
+
+    def __init__(
+        self,
+        client: RealtimeClient,
+        subscribe_message: Optional[Callable[[str], dict]] = None,
+        unsubscribe_message: Optional[Callable[[str], dict]] = None,
+        key: Callable[[dict], Optional[str]] = quote_security_id,
+        queue_size: int = 10000,
+    ):
+        self.client = client
+        self.subscribe_message = subscribe_message
+        self.unsubscribe_message = unsubscribe_message
+        self.key = key
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        client.on("PRICE_QUOTE", self.publish, queue_size=queue_size)
+
+    async def subscribe(
+        self,
+        security_ids: Iterable[str] = (ALL_SECURITIES,),
+        maxsize: int = 100,
+        overflow: str = "drop_oldest",
+    ) -> Subscription:
+        """
+        Subscribe to the quotes of ***security_ids***, "*" receives every quote.
+        Where ***overflow*** is one of [drop_oldest, conflate, block]: autoset "drop_oldest".
+        """
+        if isinstance(security_ids, str):
+            security_ids = [security_ids]
+        subscription = Subscription(self, set(security_ids), maxsize, overflow)
+        for security_id in subscription.security_ids:
+            subscribers = self._subscribers.setdefault(security_id, set())
+            if not subscribers and self._upstream(security_id):
+                await self.client.subscribe(self.subscribe_message(security_id))
+            subscribers.add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        for security_id in subscription.security_ids:
+            subscribers = self._subscribers.get(security_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(security_id, None)
+                if self._upstream(security_id):
+                    unsubscribe_message = None
+                    if self.unsubscribe_message is not None:
+                        unsubscribe_message = self.unsubscribe_message(security_id)
+                    await self.client.unsubscribe(
+                        self.subscribe_message(security_id), unsubscribe_message
+                    )
+
+    def _upstream(self, security_id: str) -> bool:
+        return self.subscribe_message is not None and security_id != ALL_SECURITIES
+
+    async def publish(self, event: dict):
+        """ deliver a PRICE_QUOTE event to every subscriber of its security """
+        security_id = self.key(event)
+        subscribers = self._subscribers.get(security_id, set()) | self._subscribers.get(
+            ALL_SECURITIES, set()
+        )
+        for subscription in subscribers:
+            await subscription.put(security_id, event)
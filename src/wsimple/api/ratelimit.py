@@ -0,0 +1,145 @@
+"""
+Project Name: Wsimple
+File Name: api/ratelimit.py
+**File: Per endpoint token bucket rate limiters, in-process or shared by processes**
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from .endpoints import Endpoints
+
+# (requests per second, burst) per endpoint, endpoints missing here share the default bucket.
+DEFAULT_RATES = {
+    Endpoints.SEND_ORDER: (2, 5),
+    Endpoints.CANCEL_ORDER: (2, 5),
+    Endpoints.FIND_SECURITIES: (2, 5),
+    Endpoints.LOGIN: (10, 20),
+    Endpoints.REFRESH: (10, 20),
+}
+DEFAULT_RATE = (10, 20)
+
+
+class RateLimiter:
+    """
+    RateLimiter: token buckets keyed by endpoint, every request reserves a token
+    and waits until the bucket allows it.
+    Where ***rates*** maps endpoints to (requests per second, burst): autoset DEFAULT_RATES.
+    Where ***default*** is the (requests per second, burst) bucket shared by the other
+    endpoints, None leaves them unlimited: autoset DEFAULT_RATE.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[Endpoints, Tuple[float, float]]] = None,
+        default: Optional[Tuple[float, float]] = DEFAULT_RATE,
+    ):
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.default = default
+        self._lock = threading.Lock()
+        self._tats: Dict[str, float] = {}
+        self._local = threading.local()
+
+    def _bucket(self, endpoint: Endpoints) -> Optional[Tuple[str, float, float]]:
+        if endpoint in self.rates:
+            rate, burst = self.rates[endpoint]
+            return endpoint.name, rate, burst
+        if self.default is not None:
+            rate, burst = self.default
+            return "default", rate, burst
+        return None
+
+    @staticmethod
+    def _advance(tat: Optional[float], now: float, rate: float, burst: float):
+        """ GCRA: returns the new theoretical arrival time and the wait of this request """
+        interval = 1.0 / rate
+        tat = max(tat or now, now) + interval
+        return tat, max(0.0, tat - now - burst * interval)
+
+    def _reserve(self, name: str, rate: float, burst: float) -> float:
+        with self._lock:
+            tat, wait = self._advance(self._tats.get(name), time.monotonic(), rate, burst)
+            self._tats[name] = tat
+        return wait
+
+    def reserve(self, endpoint: Endpoints) -> float:
+        """ take a token of ***endpoint*** and return the seconds to wait before using it """
+        bucket = self._bucket(endpoint)
+        if bucket is None:
+            return 0.0
+        return self._reserve(*bucket)
+
+    def acquire(self, endpoint: Endpoints):
+        """ block the calling thread until a request to ***endpoint*** may be sent """
+        if getattr(self._local, "prepaid", None) == endpoint:
+            self._local.prepaid = None
+            return
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: Endpoints):
+        """ wait without blocking the event loop until a request to ***endpoint*** may be sent """
+        import asyncio
+
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @contextmanager
+    def prepaid(self, endpoint: Endpoints):
+        """
+        the next acquire of ***endpoint*** in this thread is free, its token was
+        already taken by acquire_async before the call was handed to the thread
+        """
+        self._local.prepaid = endpoint
+        try:
+            yield
+        finally:
+            self._local.prepaid = None
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    SQLiteRateLimiter: a RateLimiter whose buckets live in a SQLite file, so every
+    process on the host using the same ***path*** shares one budget.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rates: Optional[Dict[Endpoints, Tuple[float, float]]] = None,
+        default: Optional[Tuple[float, float]] = DEFAULT_RATE,
+    ):
+        super().__init__(rates, default)
+        self.path = path
+        self._db = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tat REAL)"
+        )
+
+    def _reserve(self, name: str, rate: float, burst: float) -> float:
+        with self._lock:
+            # BEGIN IMMEDIATE takes the database write lock before reading
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT tat FROM buckets WHERE name = ?", (name,)
+                ).fetchone()
+                tat, wait = self._advance(row and row[0], time.time(), rate, burst)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?)", (name, tat)
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return wait
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,214 @@
+"""
+Project Name: Wsimple
+File Name: api/realtime.py
+**File: Managed realtime websocket client**
+"""
+import asyncio
+import json
+import random
+from typing import Callable, Dict, List, Optional
+
+# 3 party
+import websockets
+
+EVENT_TYPES = ("GREETING", "ACCOUNT", "PRICE_QUOTE", "ORDER_FILLED")
+ALL_EVENTS = "*"
+
+
+class EventHandler:
+    """
+    EventHandler: runs one registered handler on its own bounded queue so a slow
+    consumer cannot stall the socket reader. When the queue is full the oldest
+    queued event is dropped and counted in ***dropped***.
+    Coroutine functions run on the event loop, plain functions run in the loop's
+    default executor so that blocking code does not stall the loop either,
+    unless ***executor*** is False.
+    """
+
+    def __init__(
+        self,
+        handler: Callable,
+        queue_size: int = 1000,
+        logger=None,
+        executor: bool = True,
+    ):
+        self.handler = handler
+        self.queue_size = queue_size
+        self.logger = logger
+        self.dropped = 0
+        self._blocking = executor and not asyncio.iscoroutinefunction(handler)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.ensure_future(self._worker())
+
+    def put(self, event: dict):
+        if self._queue is None:
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def _worker(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                if self._blocking:
+                    loop = asyncio.get_event_loop()
+                    result = await loop.run_in_executor(None, self.handler, event)
+                else:
+                    result = self.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as error:
+                if self.logger is not None:
+                    self.logger.error(f"realtime handler {self.handler} failed: {error}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._queue = None
+
+
+class RealtimeClient:
+    """
+    RealtimeClient: keeps a Wealthsimple websocket connected and dispatches its
+    events to handlers registered by event type (GREETING, ACCOUNT, PRICE_QUOTE,
+    ORDER_FILLED or "*" for every event).
+    A new ticket is requested through Wsimple.get_websocket_uri on every connect,
+    dropped connections are retried with jittered exponential backoff and the
+    subscriptions sent with ***subscribe*** are replayed after each reconnect.
+    """
+
+    def __init__(
+        self,
+        wsimple,
+        queue_size: int = 1000,
+        min_backoff: float = 1,
+        max_backoff: float = 60,
+    ):
+        self.wsimple = wsimple
+        self.queue_size = queue_size
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.logger = wsimple.logger
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._subscriptions: List[dict] = []
+        self._websocket = None
+        self._running = False
+        self._closed = False
+        self._attempt = 0
+
+    def on(
+        self,
+        event_type: str,
+        handler: Optional[Callable] = None,
+        queue_size=None,
+        executor: bool = True,
+    ):
+        """
+        Register a handler (sync function or coroutine function) for an event type.
+        Can be used as a decorator: @client.on("PRICE_QUOTE")
+        Where ***queue_size*** is how many events may wait for this handler: autoset client queue_size.
+        Where ***executor*** runs a sync handler in the loop's default executor, False runs it
+        on the event loop (only for handlers that never block): autoset True.
+        """
+        if handler is None:
+            return lambda handler: self.on(event_type, handler, queue_size, executor)
+        event_handler = EventHandler(
+            handler, queue_size or self.queue_size, logger=self.logger, executor=executor
+        )
+        self._handlers.setdefault(event_type, []).append(event_handler)
+        if self._running:
+            event_handler.start()
+        return handler
+
+    def off(self, event_type: str, handler: Callable):
+        """ remove a handler registered with on """
+        handlers = self._handlers.get(event_type, [])
+        for event_handler in [h for h in handlers if h.handler is handler]:
+            handlers.remove(event_handler)
+            asyncio.ensure_future(event_handler.stop())
+
+    async def send(self, message: dict):
+        """ send a message on the current connection """
+        if self._websocket is not None:
+            await self._websocket.send(json.dumps(message))
+
+    async def subscribe(self, message: dict):
+        """ send a subscription message now and again after every reconnect """
+        self._subscriptions.append(message)
+        await self.send(message)
+
+    async def unsubscribe(self, message: dict, unsubscribe_message: Optional[dict] = None):
+        """ stop replaying ***message***, optionally sending ***unsubscribe_message*** """
+        if message in self._subscriptions:
+            self._subscriptions.remove(message)
+        if unsubscribe_message is not None:
+            await self.send(unsubscribe_message)
+
+    def dispatch(self, event: dict):
+        """ hand an event to every handler of its type """
+        handlers = self._handlers.get(event.get("type"), []) + self._handlers.get(
+            ALL_EVENTS, []
+        )
+        if not handlers:
+            self.logger.debug("unhandled realtime event: {}".format(event.get("type")))
+        for event_handler in handlers:
+            event_handler.put(event)
+
+    async def _connect_once(self):
+        loop = asyncio.get_event_loop()
+        uri = await loop.run_in_executor(None, self.wsimple.get_websocket_uri)
+        async with websockets.connect(uri) as websocket:
+            self._websocket = websocket
+            self._attempt = 0
+            self.logger.debug("realtime connected")
+            for message in self._subscriptions:
+                await websocket.send(json.dumps(message))
+            async for raw in websocket:
+                self.dispatch(json.loads(raw))
+
+    async def run(self):
+        """
+        Connect and dispatch events until close is called, reconnecting on failures.
+        """
+        self._running = True
+        for handlers in self._handlers.values():
+            for event_handler in handlers:
+                event_handler.start()
+        try:
+            while not self._closed:
+                try:
+                    await self._connect_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as error:
+                    self.logger.error(f"realtime connection failed: {error}")
+                finally:
+                    self._websocket = None
+                if self._closed:
+                    break
+                delay = min(self.max_backoff, self.min_backoff * 2 ** self._attempt)
+                self._attempt += 1
+                await asyncio.sleep(delay * random.uniform(0.5, 1))
+        finally:
+            self._running = False
+            for handlers in self._handlers.values():
+                for event_handler in handlers:
+                    await event_handler.stop()
+
+    async def close(self):
+        """ stop reconnecting and close the current connection """
+        self._closed = True
+        if self._websocket is not None:
+            await self._websocket.close()
@@ -1,16 +1,145 @@
-import json
+from .concurrency import cap_timeout, remaining
 
 # errors
 from .errors import (
     InvalidAccessTokenError,
     WealthsimpleServerError,
     RouteNotFoundException,
+    MethodInputError,
 )
 
-# 3 party
-import cloudscraper as req
-from loguru import logger
-from box import Box
+import time
+from typing import TYPE_CHECKING
+
+# 3 party, box and the http stack are imported on first use
+if TYPE_CHECKING:
+    from box import Box
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+RESPONSE_FORMATS = ("box", "dict", "model")
+
+
+def parse_response(payload, response_format: str = "box", model=None):
+    """
+    Convert a decoded json payload into the requested response format.
+    "box" wraps it in a Box, "dict" returns it untouched and "model" converts
+    the payload (or every item of its "results") into ***model***.
+    """
+    if response_format not in RESPONSE_FORMATS:
+        raise MethodInputError(
+            f"response_format must be one of {RESPONSE_FORMATS}, not {response_format}"
+        )
+    if response_format == "box":
+        from box import Box
+
+        return Box(payload)
+    elif response_format == "dict" or model is None:
+        return payload
+    if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        return {
+            **payload,
+            "results": [model.from_dict(item) for item in payload["results"]],
+        }
+    return model.from_dict(payload)
+
+
+def _parse(
+    content: bytes,
+    response_list: bool,
+    response_format: str,
+    model,
+    metrics=None,
+    name: str = "",
+):
+    if metrics is None:
+        payload = loads(content)
+        if response_list:
+            payload = payload[0]
+        return parse_response(payload, response_format, model)
+    start = time.perf_counter()
+    payload = loads(content)
+    decoded = time.perf_counter()
+    if response_list:
+        payload = payload[0]
+    result = parse_response(payload, response_format, model)
+    metrics.decode(name, decoded - start, time.perf_counter() - decoded)
+    return result
+
+
+def _spent(attempt: int, attempts: int, delay: float) -> bool:
+    """ whether no retry is left, or none would start before the fan_out deadline """
+    left = remaining()
+    return attempt + 1 >= attempts or (left is not None and left <= delay)
+
+
+def _send(endpoint, url, rcloud, session, logger, request_status, kwargs):
+    """
+    send the request under the session RateLimiter, RetryPolicy and CircuitBreaker,
+    status page requests skip the limiter and breaker so they can be used as its health probe.
+    Inside a fan_out sub-request the http timeout and retries are capped to its deadline.
+    """
+    from requests.exceptions import ConnectionError, Timeout
+
+    name: str = endpoint.name
+    retry = getattr(session, "retry", None)
+    breaker = None if request_status else getattr(session, "breaker", None)
+    limiter = None if request_status else getattr(session, "limiter", None)
+    metrics = getattr(session, "metrics", None)
+    if retry is not None and "timeout" not in kwargs:
+        kwargs = {**kwargs, "timeout": retry.timeout(endpoint)}
+    attempts = retry.retries + 1 if retry is not None and retry.retryable(endpoint) else 1
+    left = remaining()
+    if left is not None and left <= 0:
+        raise Timeout(f"{name} was not sent, its deadline passed")
+    # the breaker sees one outcome per logical request, after its retries
+    if breaker is not None:
+        breaker.allow()
+    try:
+        for attempt in range(attempts):
+            if limiter is not None:
+                limiter.acquire(endpoint)
+            delay = retry.delay(attempt) if attempt + 1 < attempts else 0.0
+            if remaining() is not None:
+                kwargs = {**kwargs, "timeout": cap_timeout(kwargs.get("timeout"))}
+            logger.debug("{} called".format(name))
+            start = time.perf_counter()
+            try:
+                r = rcloud.request(method=endpoint.value[1], url=url, **kwargs)
+            except (ConnectionError, Timeout) as error:
+                if metrics is not None:
+                    metrics.request(
+                        name, type(error).__name__, time.perf_counter() - start
+                    )
+                if _spent(attempt, attempts, delay):
+                    raise
+                logger.warning("{} failed: {}, retrying".format(name, error))
+            else:
+                if metrics is not None:
+                    metrics.request(
+                        name, r.status_code, time.perf_counter() - start, len(r.content)
+                    )
+                logger.debug("{}: {}".format(name, r.status_code, r.url))
+                if r.status_code < 500:
+                    if breaker is not None:
+                        breaker.record_success()
+                    return r
+                if _spent(attempt, attempts, delay):
+                    if breaker is not None:
+                        breaker.record_failure()
+                    return r
+                logger.warning("{}: {}, retrying".format(name, r.status_code))
+            if metrics is not None:
+                metrics.retry(name)
+            time.sleep(delay)
+    except BaseException:
+        # any error settles the breaker, a half-open trial must not stay pending
+        if breaker is not None:
+            breaker.record_failure()
+        raise
 
 
 def requestor(
@@ -20,14 +149,31 @@ def requestor(
     request_status=False,
     response_list=False,
     login_refresh=False,
+    session=None,
+    response_format="box",
+    model=None,
     **kwargs,
-) -> Box:
+) -> "Box":
     name: str = endpoint.name
     url: str = endpoint.value.route.format(**args)
-    rcloud = req.create_scraper()
-    logger.debug("{} called".format(name))
-    r = rcloud.request(method=endpoint.value[1], url=url, **kwargs)
-    logger.debug("{}: {}".format(name, r.status_code, r.url))
+    if session is not None:
+        rcloud = session
+    else:
+        import cloudscraper
+
+        rcloud = cloudscraper.create_scraper()
+    cache = getattr(session, "cache", None)
+    metrics = getattr(session, "metrics", None)
+    key = None
+    if cache is not None and not login_refresh and cache.cacheable(endpoint):
+        key = cache.key(endpoint, url, kwargs.get("params"))
+        content = cache.lookup(endpoint, key)
+        if metrics is not None:
+            metrics.cache(name, content is not None)
+        if content is not None:
+            logger.debug("{} cache hit".format(name))
+            return _parse(content, response_list, response_format, model, metrics, name)
+    r = _send(endpoint, url, rcloud, session, logger, request_status, kwargs)
     if login_refresh:
         return r
     if r.status_code == 401:
@@ -38,9 +184,7 @@ def requestor(
     elif r.status_code >= 500:
         raise WealthsimpleServerError
     else:
-        if request_status:
-            return Box(json.loads(r.content))
-        elif response_list:
-            return Box(r.json()[0])
-        else:
-            return Box(r.json())
+        result = _parse(r.content, response_list, response_format, model, metrics, name)
+        if key is not None and 200 <= r.status_code < 300:
+            cache.store(endpoint, key, r.content)
+        return result
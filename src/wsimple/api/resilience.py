@@ -0,0 +1,136 @@
+"""
+Project Name: Wsimple
+File Name: api/resilience.py
+**File: Timeouts, retries and circuit breaking for requestor**
+"""
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .endpoints import Endpoints
+from .errors import CircuitOpenError
+
+# seconds before a request is abandoned, endpoints missing here use the default timeout.
+DEFAULT_TIMEOUTS = {
+    Endpoints.LOGIN: 30,
+    Endpoints.REFRESH: 30,
+    Endpoints.SEND_ORDER: 20,
+    Endpoints.GET_ACTIVITES: 30,
+    Endpoints.FIND_SECURITIES_HISTORY: 30,
+}
+
+
+class RetryPolicy:
+    """
+    RetryPolicy: per endpoint timeouts and jittered exponential retries.
+    Only requests whose method is in ***methods*** are retried, so an order is never sent twice.
+    Where ***retries*** is how often a failed request is retried: autoset 3.
+    Where ***backoff*** is the base delay in seconds, doubled every attempt up to ***max_backoff***: autoset 0.5.
+    Where ***timeouts*** maps endpoints to seconds, others use ***timeout***: autoset DEFAULT_TIMEOUTS and 10.
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10,
+        timeout: Optional[float] = 10,
+        timeouts: Optional[Dict[Endpoints, float]] = None,
+        methods: tuple = ("GET",),
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.default_timeout = timeout
+        self.timeouts = dict(DEFAULT_TIMEOUTS if timeouts is None else timeouts)
+        self.methods = methods
+
+    def timeout(self, endpoint: Endpoints) -> Optional[float]:
+        return self.timeouts.get(endpoint, self.default_timeout)
+
+    def retryable(self, endpoint: Endpoints) -> bool:
+        return endpoint.value.method in self.methods
+
+    def delay(self, attempt: int) -> float:
+        """ full jitter delay before retry number ***attempt*** (0 based) """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker: stops sending requests once ***threshold*** consecutive requests
+    failed (5XX or connection errors once their retries are spent) and raises
+    CircuitOpenError instead.
+    After ***reset_timeout*** seconds ***probe*** is asked whether Wealthsimple is
+    back, when it is (or no probe is set) one trial request is let through and its
+    outcome closes or reopens the breaker.
+    Where ***probe*** returns True when the platform is healthy: autoset None.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        reset_timeout: float = 30,
+        probe: Optional[Callable[[], bool]] = None,
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+        self._probing = False
+
+    def _healthy(self) -> bool:
+        if self.probe is None:
+            return True
+        try:
+            return bool(self.probe())
+        except Exception:
+            return False
+
+    def allow(self):
+        """ raise CircuitOpenError unless a request may be sent now """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if (
+                self.state == self.HALF_OPEN
+                or self._probing
+                or time.monotonic() - self.opened_at < self.reset_timeout
+            ):
+                raise CircuitOpenError(self.retry_after())
+            self._probing = True
+        healthy = self._healthy()
+        with self._lock:
+            self._probing = False
+            if not healthy:
+                self.opened_at = time.monotonic()
+                raise CircuitOpenError(self.retry_after())
+            self.state = self.HALF_OPEN
+
+    def retry_after(self) -> float:
+        """ seconds until the breaker probes again """
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def reset(self):
+        """ close the breaker by hand """
+        self.record_success()
@@ -0,0 +1,181 @@
+"""
+Project Name: Wsimple
+File Name: api/securities.py
+**File: Security master index filled from search and group responses**
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .errors import MethodInputError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS securities (
+    id TEXT PRIMARY KEY,
+    symbol TEXT,
+    exchange TEXT,
+    mic TEXT,
+    seen REAL,
+    data TEXT NOT NULL
+);
+"""
+
+
+def _is_security(data) -> bool:
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get("id"), str)
+        and data["id"].startswith("sec-")
+        and isinstance(data.get("stock"), dict)
+    )
+
+
+def _listing(data: dict) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    stock = data["stock"]
+    mic = stock.get("primary_mic") or stock.get("mic") or data.get("mic")
+    return stock.get("symbol"), stock.get("primary_exchange"), mic
+
+
+class SecurityMaster:
+    """
+    SecurityMaster: index of every security seen in a response, answering
+    ticker -> id, id -> security and (symbol, exchange or MIC) -> id without a request.
+    Where ***path*** is a SQLite file keeping the index between runs, None keeps it in memory: autoset None.
+    Where ***ttl*** is how long an entry is trusted before a lookup misses and the
+    security is fetched again, None never expires: autoset 1 day.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, ttl: Optional[timedelta] = timedelta(days=1)
+    ):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, Tuple[float, dict]] = {}
+        self._by_symbol: Dict[str, Dict[str, None]] = {}
+        self._by_listing: Dict[Tuple[str, str], str] = {}
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+            for seen, data in self._db.execute("SELECT seen, data FROM securities"):
+                self._index(json.loads(data), seen)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, sec_id: str) -> bool:
+        return self.by_id(sec_id) is not None
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+
+    def _index(self, data: dict, seen: float):
+        symbol, exchange, mic = _listing(data)
+        self._by_id[data["id"]] = (seen, data)
+        if symbol:
+            symbol = symbol.upper()
+            # every listing of a symbol is kept, cross-listed symbols need an exchange
+            self._by_symbol.setdefault(symbol, {})[data["id"]] = None
+            for venue in (exchange, mic):
+                if venue:
+                    self._by_listing[(symbol, venue.upper())] = data["id"]
+
+    def _fresh(self, sec_id: Optional[str]) -> Optional[dict]:
+        entry = self._by_id.get(sec_id)
+        if entry is None:
+            return None
+        seen, data = entry
+        if self.ttl is not None and time.time() - seen > self.ttl.total_seconds():
+            return None
+        return data
+
+    #! fill functions
+    def add(self, securities: Iterable[dict]) -> int:
+        """ index ***securities***, entries that are not securities are skipped """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for data in securities:
+                if not _is_security(data):
+                    continue
+                data = json.loads(json.dumps(data))
+                self._index(data, now)
+                rows.append((data["id"], *_listing(data), now, json.dumps(data)))
+            if self._db is not None and rows:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO securities VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+        return len(rows)
+
+    def add_response(self, response) -> int:
+        """
+        index the securities of a response: a single security, a model or a page of "results"
+        """
+        response = getattr(response, "raw", response)
+        if not isinstance(response, dict):
+            return 0
+        if _is_security(response):
+            return self.add([response])
+        results = response.get("results")
+        if isinstance(results, list):
+            return self.add(results)
+        return 0
+
+    def invalidate(self, sec_id: Optional[str] = None):
+        """ forget ***sec_id***, or every security when None """
+        with self._lock:
+            if sec_id is None:
+                self._by_id.clear()
+                self._by_symbol.clear()
+                self._by_listing.clear()
+            else:
+                self._by_id.pop(sec_id, None)
+                for ids in self._by_symbol.values():
+                    ids.pop(sec_id, None)
+            if self._db is not None:
+                with self._db:
+                    if sec_id is None:
+                        self._db.execute("DELETE FROM securities")
+                    else:
+                        self._db.execute(
+                            "DELETE FROM securities WHERE id = ?", (sec_id,)
+                        )
+
+    #! lookup functions
+    def by_id(self, sec_id: str) -> Optional[dict]:
+        """ the indexed security of ***sec_id*** """
+        return self._fresh(sec_id)
+
+    def listings(self, symbol: str) -> List[dict]:
+        """ every indexed security of ***symbol***, one per listing """
+        ids = list(self._by_symbol.get(symbol.upper(), ()))
+        return [data for data in map(self._fresh, ids) if data is not None]
+
+    def id_for(self, symbol: str, exchange: Optional[str] = None) -> Optional[str]:
+        """
+        The security id of ***symbol***, None when it is not indexed.
+        Where ***exchange*** is an exchange name (NASDAQ, TSX) or MIC (XNAS, XTSE): autoset None.
+        Raises MethodInputError when ***exchange*** is None and the symbol has several listings.
+        """
+        if exchange is not None:
+            sec_id = self._by_listing.get((symbol.upper(), exchange.upper()))
+            return sec_id if self._fresh(sec_id) is not None else None
+        listings = self.listings(symbol)
+        if len(listings) > 1:
+            venues = ", ".join(str(_listing(data)[1]) for data in listings)
+            raise MethodInputError(
+                f"{symbol} is listed on {venues}, pass an exchange to pick one"
+            )
+        return listings[0]["id"] if listings else None
+
+    def by_symbol(self, symbol: str, exchange: Optional[str] = None) -> Optional[dict]:
+        """ the indexed security of ***symbol***, see id_for """
+        return self._fresh(self.id_for(symbol, exchange))
@@ -0,0 +1,97 @@
+"""
+Project Name: Wsimple
+File Name: api/session.py
+**File: Pooled, persistent http session shared by every requestor call**
+"""
+import threading
+from typing import Optional
+
+from .cache import ResponseCache
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .resilience import CircuitBreaker, RetryPolicy
+
+
+class SessionPool:
+    """
+    SessionPool: holds one keep-alive cloudscraper session per Wsimple instance.
+    The cloudflare challenge is solved once and the underlying urllib3 pools
+    keep up to ***pool_size*** connections open per host for reuse.
+    Where ***cache*** is a ResponseCache consulted by requestor for GET endpoints: autoset None.
+    Where ***retry*** is the RetryPolicy (timeouts and retries) of requestor calls: autoset None.
+    Where ***breaker*** is a CircuitBreaker shared by every request of the session: autoset None.
+    Where ***limiter*** is a RateLimiter paced before every request of the session: autoset None.
+    Where ***metrics*** is a Metrics recording every request of the session: autoset None.
+    Where ***scraper*** is False to use a plain requests session, which skips loading the
+    cloudflare scraper stack for public-only clients: autoset True.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        pool_block: bool = False,
+        cache: Optional[ResponseCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        scraper: bool = True,
+    ):
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.cache = cache
+        self.retry = retry
+        self.breaker = breaker
+        self.limiter = limiter
+        self.metrics = metrics
+        self.scraper = scraper
+        self._lock = threading.Lock()
+        self._session = None
+
+    @property
+    def session(self):
+        """ lazily create the underlying scraper session """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        # 3 party, imported here so that importing wsimple stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        adapter = lambda: HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            pool_block=self.pool_block,
+        )
+        if self.scraper:
+            import cloudscraper
+
+            session = cloudscraper.create_scraper()
+            # resize the cloudscraper cipher suite adapter instead of replacing it
+            https = session.get_adapter("https://")
+            https._pool_connections = self.pool_size
+            https._pool_maxsize = self.pool_size
+            https._pool_block = self.pool_block
+            https.init_poolmanager(
+                self.pool_size, self.pool_size, block=self.pool_block
+            )
+        else:
+            session = requests.Session()
+            session.mount("https://", adapter())
+        session.mount("http://", adapter())
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    def request(self, method: str, url: str, **kwargs):
+        return self.session.request(method=method, url=url, **kwargs)
+
+    def close(self):
+        """ close every pooled connection """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,215 @@
+"""
+Project Name: Wsimple
+File Name: api/store.py
+**File: Local SQLite store of synced activities and orders**
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from .api import _parse_timestamp
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    id TEXT PRIMARY KEY,
+    occurred_at TEXT,
+    type TEXT,
+    account_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS activities_occurred_at ON activities (occurred_at);
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    status TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_status ON orders (status);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class LocalStore:
+    """
+    LocalStore: keeps every activity and order already downloaded in a SQLite
+    file so that later syncs only fetch what is new and order/activity queries
+    can be answered without calling Wealthsimple.
+    Where ***path*** is the SQLite file: autoset ":memory:".
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _get_state(self, name: str) -> Optional[str]:
+        row = self._db.execute(
+            "SELECT value FROM sync_state WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name: str, value: str):
+        self._db.execute(
+            "INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)",
+            (name, value),
+        )
+
+    def last_synced(self, name: str) -> Optional[datetime]:
+        """ when ***name*** (activities or orders) was last synced """
+        with self._lock:
+            value = self._get_state(f"{name}_synced_at")
+        return datetime.fromisoformat(value) if value else None
+
+    #! sync functions
+    def sync_activities(
+        self, wsimple, tokens=None, overlap: timedelta = timedelta(days=7), **kwargs
+    ) -> int:
+        """
+        Download the activities that are new or changed and return how many were added or updated.
+        The first sync walks the whole history, later syncs stop at the first page
+        that holds an activity which is already stored and reaches back past the
+        ***overlap*** window, so recent activities that changed status (pending to
+        accepted, ...) are stored again.
+        Where ***overlap*** is how far back already stored activities are re-checked: autoset 7 days.
+        Extra arguments are passed to Wsimple.iter_activity_pages.
+        """
+        with self._lock:
+            complete = self._get_state("activities_complete") == "1"
+        cutoff = datetime.now(timezone.utc) - overlap
+        changed = 0
+        pages = wsimple.iter_activity_pages(
+            tokens=tokens, response_format="dict", **kwargs
+        )
+        for page in pages:
+            if not page:
+                continue
+            data = {activity["id"]: json.dumps(activity) for activity in page}
+            with self._lock, self._db:
+                stored = dict(
+                    self._db.execute(
+                        "SELECT id, data FROM activities WHERE id IN ({})".format(
+                            ",".join("?" * len(data))
+                        ),
+                        list(data),
+                    )
+                )
+                rows = [
+                    (
+                        activity["id"],
+                        activity.get("occurred_at"),
+                        activity.get("type"),
+                        activity.get("account_id"),
+                        data[activity["id"]],
+                    )
+                    for activity in page
+                    if stored.get(activity["id"]) != data[activity["id"]]
+                ]
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO activities VALUES (?, ?, ?, ?, ?)", rows
+                )
+            changed += len(rows)
+            # pages are newest first, the last activity is the oldest of the page
+            oldest = page[-1].get("occurred_at")
+            if complete and stored and (not oldest or _parse_timestamp(oldest) < cutoff):
+                break
+        with self._lock, self._db:
+            if not kwargs:
+                self._set_state("activities_complete", "1")
+            self._set_state("activities_synced_at", datetime.now().isoformat())
+        return changed
+
+    def sync_orders(self, wsimple, tokens=None) -> int:
+        """
+        Download the orders and store the ones that are new or changed status.
+        Returns how many orders were added or updated.
+        ! The orders endpoint has no cursor, so the list itself is still downloaded.
+        """
+        orders = wsimple.get_orders(tokens=tokens, response_format="dict")["results"]
+        with self._lock, self._db:
+            stored = dict(self._db.execute("SELECT order_id, status FROM orders"))
+            rows = [
+                (
+                    order["order_id"],
+                    order.get("status"),
+                    order.get("created_at"),
+                    json.dumps(order),
+                )
+                for order in orders
+                if stored.get(order["order_id"], object()) != order.get("status")
+            ]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?)", rows
+            )
+            self._set_state("orders_synced_at", datetime.now().isoformat())
+        return len(rows)
+
+    def sync(self, wsimple, tokens=None) -> dict:
+        """
+        Sync both activities and orders.
+        """
+        return {
+            "activities": self.sync_activities(wsimple, tokens=tokens),
+            "orders": self.sync_orders(wsimple, tokens=tokens),
+        }
+
+    #! local query functions
+    def _orders_by_status(self, status: str) -> List[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM orders WHERE status = ? ORDER BY created_at DESC",
+                (status,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_order(self, order_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM orders WHERE order_id = ?", (order_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def pending_orders(self) -> List[dict]:
+        """ stored orders that are still submitted """
+        return self._orders_by_status("submitted")
+
+    def cancelled_orders(self) -> List[dict]:
+        """ stored orders that were cancelled """
+        return self._orders_by_status("cancelled")
+
+    def filled_orders(self) -> List[dict]:
+        """ stored orders that were filled """
+        return self._orders_by_status("posted")
+
+    def activities(
+        self,
+        type: Optional[str] = None,
+        since: Optional[str] = None,
+        account_id: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Stored activities, newest first.
+        Where ***since*** is an ISO-8601 timestamp, older activities are left out.
+        """
+        query, params = "SELECT data FROM activities WHERE 1 = 1", []
+        if type is not None:
+            query += " AND type = ?"
+            params.append(type)
+        if since is not None:
+            query += " AND occurred_at >= ?"
+            params.append(since)
+        if account_id is not None:
+            query += " AND account_id = ?"
+            params.append(account_id)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY occurred_at DESC", params)
+            return [json.loads(row[0]) for row in rows]
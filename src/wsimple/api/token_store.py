@@ -0,0 +1,213 @@
+"""
+Project Name: Wsimple
+File Name: api/token_store.py
+**File: Persistent token stores shared by processes through a file lock**
+"""
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Optional, Union
+
+from .tokens import TokensBox
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+    import msvcrt
+
+
+def box_to_dict(box: TokensBox) -> dict:
+    return {
+        "access_token": box.access_token,
+        "refresh_token": box.refresh_token,
+        "access_expires": box.access_expires.isoformat(),
+    }
+
+
+def box_from_dict(data: dict) -> TokensBox:
+    return TokensBox(
+        data["access_token"],
+        data["refresh_token"],
+        datetime.fromisoformat(data["access_expires"]),
+    )
+
+
+class FileLock:
+    """
+    FileLock: re-entrant lock held by one thread of one process at a time,
+    through flock (or msvcrt on windows) on ***path***.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self):
+        self._lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            self._file = open(self.path, "a+")
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class TokenStore(ABC):
+    """
+    TokenStore: base of the persistent token stores used by Wsimple and TokenManager.
+    ***load*** returns the stored TokensBox or None, ***save*** replaces it and
+    ***lock*** is held around a refresh so that only one process refreshes a token set.
+    Where ***lock_path*** is the lock file: autoset None (lock only inside this process).
+    """
+
+    def __init__(self, lock_path: Optional[str] = None):
+        self._lock = FileLock(lock_path) if lock_path else threading.RLock()
+
+    @contextmanager
+    def lock(self):
+        with self._lock:
+            yield self
+
+    @abstractmethod
+    def load(self) -> Optional[TokensBox]:
+        """ the stored TokensBox, None when nothing is stored """
+
+    @abstractmethod
+    def save(self, box: TokensBox):
+        """ replace the stored tokens with ***box*** """
+
+
+class FileTokenStore(TokenStore):
+    """
+    FileTokenStore: keeps the tokens in a json file (mode 600), locked through ***path***.lock.
+    Where ***key*** is a Fernet key encrypting the file, needs cryptography: autoset None.
+    """
+
+    def __init__(self, path: str, key: Union[str, bytes, None] = None):
+        super().__init__(path + ".lock")
+        self.path = path
+        self._fernet = None
+        if key is not None:
+            try:
+                from cryptography.fernet import Fernet
+            except ImportError:
+                raise ImportError(
+                    "encrypted token files require cryptography: pip install cryptography"
+                )
+            self._fernet = Fernet(key)
+
+    @staticmethod
+    def generate_key() -> bytes:
+        """ a new Fernet key for ***key*** """
+        from cryptography.fernet import Fernet
+
+        return Fernet.generate_key()
+
+    def load(self) -> Optional[TokensBox]:
+        try:
+            with open(self.path, "rb") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+        if self._fernet is not None:
+            content = self._fernet.decrypt(content)
+        return box_from_dict(json.loads(content))
+
+    def save(self, box: TokensBox):
+        content = json.dumps(box_to_dict(box)).encode()
+        if self._fernet is not None:
+            content = self._fernet.encrypt(content)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".wsimple-tokens-")
+        try:
+            os.chmod(tmp, 0o600)
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+class KeyringTokenStore(TokenStore):
+    """
+    KeyringTokenStore: keeps the tokens in the system keyring, needs keyring.
+    Where ***username*** is the keyring entry, usually the Wealthsimple email.
+    Where ***lock_path*** is the lock file: autoset wsimple-<username>.lock in the temp directory.
+    """
+
+    def __init__(
+        self, username: str, service: str = "wsimple", lock_path: Optional[str] = None
+    ):
+        try:
+            import keyring
+        except ImportError:
+            raise ImportError("KeyringTokenStore requires keyring: pip install keyring")
+        if lock_path is None:
+            safe = "".join(c if c.isalnum() else "_" for c in username)
+            lock_path = os.path.join(tempfile.gettempdir(), f"wsimple-{safe}.lock")
+        super().__init__(lock_path)
+        self._keyring = keyring
+        self.username = username
+        self.service = service
+
+    def load(self) -> Optional[TokensBox]:
+        content = self._keyring.get_password(self.service, self.username)
+        return box_from_dict(json.loads(content)) if content else None
+
+    def save(self, box: TokensBox):
+        self._keyring.set_password(
+            self.service, self.username, json.dumps(box_to_dict(box))
+        )
+
+
+class CallbackTokenStore(TokenStore):
+    """
+    CallbackTokenStore: hands the tokens to user functions, e.g. a secret manager.
+    Where ***load*** returns the stored TokensBox or None and ***save*** receives every new TokensBox.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Optional[TokensBox]],
+        save: Callable[[TokensBox], None],
+        lock_path: Optional[str] = None,
+    ):
+        super().__init__(lock_path)
+        self._load = load
+        self._save = save
+
+    def load(self) -> Optional[TokensBox]:
+        return self._load()
+
+    def save(self, box: TokensBox):
+        self._save(box)
@@ -1,6 +1,8 @@
-from typing import List, Dict
+import threading
+import time
+from typing import Callable, List, Dict, Optional
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 @dataclass
@@ -17,3 +19,142 @@ class TokensBox:
             {"Authorization": self.access_token},
             {"refresh_token": self.refresh_token},
         ]
+
+
+class TokenManager:
+    """
+    TokenManager: single-flight coordinator for TokensBox refreshes.
+    Only one refresh runs at a time, callers that find the tokens inside the
+    ***window*** wait on it and reuse its result instead of refreshing again.
+    With ***background*** set, the tokens are refreshed on a timer ***lead*** before
+    the window opens so that requests never pay the refresh latency inline.
+    Where ***metrics*** is a Metrics recording every refresh: autoset None.
+    Where ***store*** is a TokenStore written after every refresh, the refresh runs under
+    its lock and adopts tokens another process already refreshed instead: autoset None.
+    Where ***min_interval*** is the shortest delay between background refreshes, tokens living
+    less than window + lead would otherwise be refreshed in a loop: autoset 30 seconds.
+    A failed background refresh is retried after min_interval, doubling up to ***max_backoff***.
+    """
+
+    def __init__(
+        self,
+        box: TokensBox,
+        refresh: Callable[[List[Dict[str, str]]], TokensBox],
+        window: timedelta = timedelta(minutes=15),
+        lead: timedelta = timedelta(minutes=1),
+        background: bool = True,
+        logger=None,
+        metrics=None,
+        store=None,
+        min_interval: timedelta = timedelta(seconds=30),
+        max_backoff: timedelta = timedelta(minutes=5),
+    ):
+        self.box = box
+        self.window = window
+        self.lead = lead
+        self.background = background
+        self.logger = logger
+        self.metrics = metrics
+        self.store = store
+        self.min_interval = min_interval
+        self.max_backoff = max_backoff
+        self._failures = 0
+        self._refresh = refresh
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._listeners: List[Callable[[TokensBox], None]] = []
+        self._schedule()
+
+    def tokens(self) -> List[Dict[str, str]]:
+        """ current tokens, refreshed first if they expire within the window """
+        box = self.box
+        if box.access_expires - datetime.now() < self.window:
+            box = self.refresh(stale=box)
+        return box.tokens
+
+    def refresh(self, stale: Optional[TokensBox] = None) -> TokensBox:
+        """
+        Refresh the tokens. When ***stale*** is given and another caller already
+        replaced it while we waited, the new tokens are returned without refreshing.
+        """
+        with self._lock:
+            if stale is not None and self.box is not stale:
+                return self.box
+            if self.store is None:
+                self._run_refresh()
+            else:
+                with self.store.lock():
+                    stored = self.store.load()
+                    if (
+                        stored is not None
+                        and stored.access_token != self.box.access_token
+                        and stored.access_expires - datetime.now() >= self.window
+                    ):
+                        self.box = stored
+                    else:
+                        self._run_refresh()
+                        self.store.save(self.box)
+            for listener in self._listeners:
+                listener(self.box)
+            self._schedule()
+            return self.box
+
+    def _run_refresh(self):
+        start = time.perf_counter()
+        try:
+            self.box = self._refresh(self.box.tokens)
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.token_refresh(time.perf_counter() - start, ok=False)
+            raise
+        if self.metrics is not None:
+            self.metrics.token_refresh(time.perf_counter() - start)
+
+    def replace(self, box: TokensBox):
+        """ swap in tokens obtained elsewhere (login, another process) """
+        with self._lock:
+            self.box = box
+            self._schedule()
+
+    def add_listener(self, listener: Callable[[TokensBox], None]):
+        """ call ***listener*** with the new TokensBox after every refresh """
+        self._listeners.append(listener)
+
+    def _schedule(self, delay: Optional[float] = None):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.background:
+            return
+        if delay is None:
+            due = self.box.access_expires - self.window - self.lead - datetime.now()
+            delay = max(due.total_seconds(), self.min_interval.total_seconds())
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh(stale=self.box)
+        except Exception as error:
+            self._failures += 1
+            delay = min(
+                self.min_interval.total_seconds() * 2 ** (self._failures - 1),
+                self.max_backoff.total_seconds(),
+            )
+            if self.logger is not None:
+                self.logger.error(
+                    f"background token refresh failed: {error}, retrying in {delay:.0f}s"
+                )
+            with self._lock:
+                self._schedule(delay)
+        else:
+            self._failures = 0
+
+    def stop(self):
+        """ cancel the background refresh """
+        with self._lock:
+            self.background = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None